@@ -1,13 +1,37 @@
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Connect to MongoDB
+# === MongoDB connection settings ===
 MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0")) or None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000"))
+# 0 waits as long as the operation takes
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0")) or None
+# How long a request may wait for a free pooled connection (0: no limit)
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0")) or None
+# e.g. "secondaryPreferred" to move reads off the primary; reads may then lag just-written data
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+
+CLIENT_OPTIONS = {
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": MONGO_MIN_POOL_SIZE,
+    "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+    "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+    "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+    "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    "readPreference": MONGO_READ_PREFERENCE,
+}
+
+# Connect to MongoDB (blocking client: worker threads, background jobs, scripts)
+client = MongoClient(MONGO_URI, **CLIENT_OPTIONS)
 
 # Select Database
 db = client["nextgen_db"]
@@ -15,4 +39,8 @@ db = client["nextgen_db"]
 # Collections
 users_collection = db["users"]
 interviews_collection = db["interviews"]  # For interview sessions
-feedback_collection = db["feedback_collection"]
\ No newline at end of file
+feedback_collection = db["feedback_collection"]
+
+# Async client for code on the event loop (see app/repositories.py); it has its own pool
+async_client = AsyncMongoClient(MONGO_URI, **CLIENT_OPTIONS)
+async_db = async_client["nextgen_db"]
@@ -0,0 +1,140 @@
+"""
+Indexes every collection needs, created idempotently at startup, and a query-plan audit of the
+lookups the routes run on every request:
+
+    python -m app.indexes --create    # create missing indexes
+    python -m app.indexes --check     # explain each hot query; exit 1 if any is a COLLSCAN
+
+--check is meant for CI against a disposable mongod (point MONGO_URI at it); combine both flags
+to create the indexes first. The API also runs the audit at startup and logs any COLLSCAN. Services that create their own TTL indexes lazily keep doing so;
+the specs here match them, so creating both is a no-op.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+# === Index settings ===
+CREATE_INDEXES_ON_STARTUP = os.getenv("CREATE_INDEXES_ON_STARTUP", "1") == "1"
+# Explain HOT_QUERIES at startup and log any that would scan a whole collection
+AUDIT_QUERY_PLANS_ON_STARTUP = os.getenv("AUDIT_QUERY_PLANS_ON_STARTUP", "1") == "1"
+
+REQUIRED_INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("username", ASCENDING)], unique=True),
+    ],
+    "interviews": [
+        IndexModel([("interview_id", ASCENDING)], unique=True),
+        # user_interviews lists a user's interviews, newest first
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "feedback_collection": [
+        IndexModel([("interview_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+    ],
+    "feedback_sessions": [
+        IndexModel([("interview_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+    ],
+    "question_feedback": [
+        IndexModel([("user_id", ASCENDING), ("interview_id", ASCENDING), ("attempt_number", ASCENDING),
+                    ("question_index", ASCENDING)], unique=True),
+    ],
+    "question_sets": [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)],
+    "llm_cache": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        IndexModel([("last_access", ASCENDING)]),
+    ],
+    "llm_rate_limit": [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)],
+}
+
+# (description, collection, filter, sort) of the lookups on the request path
+HOT_QUERIES = [
+    ("interview by id", "interviews", {"interview_id": "probe"}, None),
+    ("interviews of a user", "interviews", {"user_id": "probe"}, [("created_at", DESCENDING)]),
+    ("user by email", "users", {"email": "probe@example.com"}, None),
+    ("user by email or username", "users", {"$or": [{"email": "probe@example.com"}, {"username": "probe"}]}, None),
+    ("feedback session", "feedback_collection", {"interview_id": "probe", "user_id": "probe"}, None),
+    ("feedback session (per question)", "feedback_sessions", {"interview_id": "probe", "user_id": "probe"}, None),
+    ("feedback of an interview (per question)", "question_feedback", {"user_id": "probe", "interview_id": "probe"},
+     [("user_id", ASCENDING), ("interview_id", ASCENDING), ("attempt_number", ASCENDING), ("question_index", ASCENDING)]),
+]
+
+
+def ensure_indexes(database=None) -> List[str]:
+    """
+    Creates any missing REQUIRED_INDEXES and returns the names of the indexes that exist
+    afterwards. Existing indexes are left alone. An index that cannot be built (e.g. a unique
+    index over data that already has duplicates) is reported and skipped, not raised.
+    """
+    if database is None:
+        from app.database import db as database
+    created = []
+    for collection, indexes in REQUIRED_INDEXES.items():
+        for index in indexes:
+            try:
+                created += database[collection].create_indexes([index])
+            except OperationFailure as e:
+                print(f"Could not create index {index.document['name']} on {collection}: {e}")
+    return created
+
+
+def _plan_stages(plan) -> List[str]:
+    """Every stage name in an explain() plan tree (classic or slot-based engine output)."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages += _plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            stages += _plan_stages(value)
+    return stages
+
+
+def check_query_plans(database=None) -> List[dict]:
+    """The winning plan of each HOT_QUERIES entry; "collscan" is True where it scans the collection."""
+    if database is None:
+        from app.database import db as database
+    results = []
+    for description, collection, query, sort in HOT_QUERIES:
+        cursor = database[collection].find(query).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        stages = _plan_stages(cursor.explain()["queryPlanner"]["winningPlan"])
+        results.append({"query": description, "collection": collection, "stages": stages, "collscan": "COLLSCAN" in stages})
+    return results
+
+
+def audit_query_plans(database=None) -> List[dict]:
+    """check_query_plans, logging a warning for each query that would scan its collection."""
+    results = check_query_plans(database)
+    for result in results:
+        if result["collscan"]:
+            print(f"Query plan audit: COLLSCAN for {result['collection']}: {result['query']} {result['stages']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the app's MongoDB indexes and audit hot query plans.")
+    parser.add_argument("--create", action="store_true", help="create missing indexes")
+    parser.add_argument("--check", action="store_true", help="explain hot queries and fail on a COLLSCAN")
+    args = parser.parse_args()
+    if not (args.create or args.check):
+        parser.error("pass --create, --check or both")
+
+    if args.create:
+        print(f"Indexes: {ensure_indexes()}")
+    if args.check:
+        results = check_query_plans()
+        for result in results:
+            print(f"{'COLLSCAN' if result['collscan'] else 'ok':>8}  {result['collection']}: {result['query']} {result['stages']}")
+        if any(result["collscan"] for result in results):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
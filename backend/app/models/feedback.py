@@ -39,6 +39,7 @@ class AttemptFeedback(BaseModel):
 class Feedback(BaseModel):
     interview_id: str
     user_id: str
+    attempt_count: int = 0
     attempts: List[AttemptFeedback]
 
 
@@ -9,7 +9,8 @@ class InterviewSession(BaseModel):
     job_description: str
     interview_type: str
     difficulty_level: str
-    parsed_resume: Dict
+    parsed_resume: Optional[Dict] = None
+    resume_hash: Optional[str] = None
     questions: Optional[Dict] = None
     sample_answers:Optional[Dict] = None
     created_at: datetime
@@ -0,0 +1,131 @@
+"""
+Async data access for the routes. Each repository wraps collections of the async client in
+app/database.py, so awaiting a query yields the event loop instead of blocking it the way the
+pymongo calls in a route did. Background jobs and worker threads keep the blocking client and
+the service modules (feedback_store, resume_index); both sides share the same query specs.
+"""
+from typing import Iterable, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+
+from app.database import async_db
+from app.services import feedback_store, interview_cache
+from app.services.feedback_store import (
+    COUNT_PROJECTION, EMBEDDED_NUMBERS_PROJECTION, NEXT_ATTEMPT_COUNTER, NEXT_EMBEDDED_ATTEMPT, QUESTION_FEEDBACK_KEY,
+    attempt_filter, embedded_attempts, embedded_latest, embedded_list_projection, group_questions, question_list_query
+)
+
+
+class InterviewRepository:
+    """Interview documents, read through projections of just the fields each caller returns."""
+
+    def __init__(self, database=async_db):
+        self._interviews = database["interviews"]
+
+    async def get(self, interview_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+        return await self._interviews.find_one({"interview_id": interview_id}, {"_id": 0, **(projection or {})})
+
+    async def get_cached(self, interview_id: str, fields: Iterable[str]) -> Optional[dict]:
+        """Same as interview_cache.get_interview, on the async client."""
+        fields = tuple(fields)
+        if not interview_cache.interview_cache.enabled:
+            return await self.get(interview_id, {field: 1 for field in fields})
+        interview = interview_cache.interview_cache.get(interview_id)
+        if interview is None:
+            interview = await self._interviews.find_one({"interview_id": interview_id}, interview_cache.CACHED_PROJECTION)
+            interview_cache.remember(interview_id, interview)
+        return interview_cache.select(interview, fields)
+
+    async def get_question(self, interview_id: str, index: int) -> Optional[dict]:
+        """
+        questions, sample_answers_status and sample_answers holding at most the answer at index.
+        Without the cache only that answer is read ($slice).
+        """
+        if not interview_cache.interview_cache.enabled:
+            return await self.get(
+                interview_id, {"questions": 1, "sample_answers": {"$slice": [index, 1]}, "sample_answers_status": 1}
+            )
+        interview = await self.get_cached(interview_id, ("questions", "sample_answers", "sample_answers_status"))
+        if interview is not None and "sample_answers" in interview:
+            interview["sample_answers"] = interview["sample_answers"][index:index + 1]
+        return interview
+
+    async def insert(self, interview: dict):
+        # insert_one adds _id to the dict it is given; keep the caller's copy clean
+        await self._interviews.insert_one(dict(interview))
+        interview_cache.invalidate(interview["interview_id"])
+
+    async def set_fields(self, interview_id: str, fields: dict):
+        await self._interviews.update_one({"interview_id": interview_id}, {"$set": fields})
+        interview_cache.invalidate(interview_id)
+
+    async def list_for_user(self, user_id: str, projection: dict) -> List[dict]:
+        cursor = self._interviews.find({"user_id": user_id}, {"_id": 0, **projection}).sort("created_at", DESCENDING)
+        return await cursor.to_list()
+
+
+class FeedbackRepository:
+    """Async counterpart of the session reads and writes in app/services/feedback_store.py."""
+
+    def __init__(self, database=async_db):
+        self._embedded = database[feedback_store.feedback_collection.name]
+        self._sessions = database[feedback_store.feedback_sessions_collection.name]
+        self._questions = database[feedback_store.question_feedback_collection.name]
+        self._indexed = False
+
+    async def _ensure_indexes(self):
+        # Same keys as feedback_store._ensure_indexes, for when CREATE_INDEXES_ON_STARTUP=0
+        if not self._indexed:
+            await self._sessions.create_index([("interview_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
+            await self._questions.create_index([(field, ASCENDING) for field in QUESTION_FEEDBACK_KEY], unique=True)
+            self._indexed = True
+
+    @staticmethod
+    def _per_question() -> bool:
+        return feedback_store.FEEDBACK_SCHEMA == "per_question"
+
+    async def start_attempt(self, interview_id: str, user_id: str) -> int:
+        """Opens the next attempt in one atomic upsert (see feedback_store.start_attempt)."""
+        if self._per_question():
+            await self._ensure_indexes()
+            collection, update = self._sessions, NEXT_ATTEMPT_COUNTER
+        else:
+            collection, update = self._embedded, NEXT_EMBEDDED_ATTEMPT
+        session = await collection.find_one_and_update(
+            {"interview_id": interview_id, "user_id": user_id}, update,
+            projection=COUNT_PROJECTION, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return session["attempt_count"]
+
+    async def latest_attempt(self, interview_id: str, user_id: str) -> Optional[int]:
+        session_filter = {"interview_id": interview_id, "user_id": user_id}
+        if self._per_question():
+            session = await self._sessions.find_one(session_filter, COUNT_PROJECTION)
+            return session["attempt_count"] if session else None
+        return embedded_latest(await self._embedded.find_one(session_filter, EMBEDDED_NUMBERS_PROJECTION))
+
+    async def has_attempt(self, interview_id: str, user_id: str, attempt_number: int) -> bool:
+        if attempt_number < 1:
+            return False
+        collection = self._sessions if self._per_question() else self._embedded
+        return await collection.count_documents(attempt_filter(interview_id, user_id, attempt_number), limit=1) > 0
+
+    async def list_feedback(self, interview_id: str, user_id: str, attempt_number: Optional[int] = None,
+                            include_details: bool = True) -> Optional[List[dict]]:
+        """Same result as feedback_store.list_feedback."""
+        if self._per_question():
+            attempt_count = await self.latest_attempt(interview_id, user_id)
+            if attempt_count is None:
+                return None
+            query, projection, sort = question_list_query(interview_id, user_id, attempt_number, include_details)
+            questions = await self._questions.find(query, projection).sort(sort).to_list()
+            return group_questions(questions, attempt_count, attempt_number)
+
+        session = await self._embedded.find_one(
+            {"interview_id": interview_id, "user_id": user_id}, embedded_list_projection(attempt_number, include_details)
+        )
+        return None if session is None else embedded_attempts(session, include_details)
+
+
+interview_repository = InterviewRepository()
+feedback_repository = FeedbackRepository()
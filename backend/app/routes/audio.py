@@ -1,9 +1,63 @@
-from fastapi import APIRouter, UploadFile, File
+import json
+import numpy as np
+from fastapi import APIRouter, UploadFile, File, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+from app.services.speech_stream_service import MAX_STREAM_SECONDS, finish_stream, start_stream
 from app.utils.audio_processing import convert_speech_to_text
 
 router = APIRouter()
 
+# Plain def: FastAPI runs it on its threadpool, so concurrent uploads decode in parallel
+# on the Whisper model's workers instead of blocking the event loop.
 @router.post("/process_audio/")
-async def process_audio(audio: UploadFile = File(...)):
-    text_result = convert_speech_to_text(audio)
-    return {"transcribed_text": text_result}
+def process_audio(audio: UploadFile = File(...)):
+    result = convert_speech_to_text(audio)
+    return {
+        "transcribed_text": result["text"],
+        "words": result["words"],
+        "duration": result["duration"],
+        "speech_duration": result["speech_duration"]
+    }
+
+@router.websocket("/stream")
+async def stream_audio(websocket: WebSocket, sample_rate: int = 16000):
+    """
+    Live speech analysis while the candidate answers.
+    Binary messages: mono 16-bit little-endian PCM at sample_rate.
+    Text messages: {"type": "transcript", "text": "<newly finalized words>"} or {"type": "end"}.
+    The server replies to each audio chunk with {"type": "stats", ...} and to "end" with
+    {"type": "final", "stream_id": ..., "speech_analysis": ...}; pass stream_id to
+    /feedback/analyze-feedback/ so only the review is left to compute.
+    """
+    await websocket.accept()
+    stream_id, analyzer = start_stream(sample_rate)
+    await websocket.send_json({"type": "started", "stream_id": stream_id})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            if message.get("bytes") is not None:
+                pcm = np.frombuffer(message["bytes"], dtype="<i2").astype(np.float32) / 32768.0
+                await run_in_threadpool(analyzer.feed_audio, pcm)
+                if analyzer.samples_seen > MAX_STREAM_SECONDS * sample_rate:
+                    await websocket.close(code=1009, reason="Stream too long")
+                    return
+                await websocket.send_json({"type": "stats", **analyzer.summary()})
+                continue
+
+            payload = json.loads(message.get("text") or "{}")
+            if payload.get("type") == "transcript":
+                analyzer.feed_transcript(payload.get("text", ""))
+            elif payload.get("type") == "end":
+                summary = finish_stream(stream_id, analyzer)
+                await websocket.send_json({"type": "final", "stream_id": stream_id, "speech_analysis": summary})
+                await websocket.close()
+                return
+
+    except WebSocketDisconnect:
+        return
+    except (ValueError, json.JSONDecodeError) as e:
+        await websocket.close(code=1003, reason=f"Invalid message: {e}")
@@ -1,136 +1,225 @@
 from fastapi import APIRouter, UploadFile, Form, File, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from datetime import datetime
-import tempfile
-import shutil
+import json
+from contextlib import ExitStack
 from typing import Optional
-from app.models.feedback import Feedback, AttemptFeedback
+from starlette.concurrency import run_in_threadpool
 from app.services.feedback_service import generate_feedback
-from app.database import db
+from app.repositories import feedback_repository, interview_repository
+from app.services.feedback_store import append_question_feedback, has_attempt, latest_attempt
+from app.services.interview_cache import get_interview
+from app.services.job_queue import feedback_jobs, QueueFullError
+from app.services.speech_stream_service import claim_stream_result, release_stream_result
+from app.utils.sse import job_event_response
+from app.utils.upload_spool import SpooledAudio, UPLOAD_USE_MMAP, spool_upload
+
+# Containers soundfile can decode straight from a memory map; others are decoded from the path
+MMAP_DECODABLE_FORMATS = ("wav", "flac", "ogg")
 
 router = APIRouter()
 
 @router.post("/start_interview_session/")
 async def start_interview_session(interview_id: str = Form(...), user_id: str = Form(...)):
     try:
-        existing_feedback = db.feedback_collection.find_one({"interview_id": interview_id, "user_id": user_id})
-        if existing_feedback:
-            attempts = existing_feedback.get("attempts", [])
-            attempt_number = len(attempts) + 1
-        else:
-            attempt_number = 1
-
-        new_attempt = AttemptFeedback(
-            attempt_number=attempt_number,
-            questions_feedback=[]
-        )
-
-        if existing_feedback:
-            db.feedback_collection.update_one(
-                {"interview_id": interview_id, "user_id": user_id},
-                {"$push": {"attempts": new_attempt.dict()}},  # convert to dict for MongoDB
-                upsert=True
-            )
-        else:
-            new_feedback = Feedback(
-                interview_id=interview_id,
-                user_id=user_id,
-                attempts=[new_attempt]
-            )
-            db.feedback_collection.insert_one(new_feedback.dict())
-
+        # One atomic upsert creates the session or appends the next attempt
+        attempt_number = await feedback_repository.start_attempt(interview_id, user_id)
         return {"message": "Interview session started successfully", "attempt_number": attempt_number}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start interview session: {str(e)}")
 
 
-@router.post("/analyze-feedback/")
-async def analyze_and_save_feedback(
-    interview_id: str = Form(...),
-    question_index: int = Form(...),
-    answer_text: str = Form(...),
-    user_id: str = Form(...),
-    duration: float = Form(...),
-    audio: UploadFile = File(None),
-    transcription_text: Optional[str] = Form(None)
+def process_answer_feedback(
+    interview_id: str,
+    question_index: int,
+    answer_text: str,
+    user_id: str,
+    duration: float,
+    audio: Optional[SpooledAudio],
+    transcription_text: Optional[str],
+    words: Optional[list] = None,
+    speech_features: Optional[dict] = None,
+    attempt_number: Optional[int] = None,
+    report_stage=None
 ):
-    try:
-        # Save audio file temporarily if provided
-        audio_path = None
+    """
+    Background job: runs the feedback pipeline and appends the result to the attempt that was
+    current when the answer was submitted (attempt_number).
+    """
+    with ExitStack() as stack:
+        # The job owns the spooled upload and removes it however the pipeline ends
+        audio_source = None
         if audio:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-                shutil.copyfileobj(audio.file, temp_audio)
-                audio_path = temp_audio.name
+            stack.enter_context(audio)
+            audio_source = audio.path
+            if UPLOAD_USE_MMAP and audio.format in MMAP_DECODABLE_FORMATS:
+                audio_source = stack.enter_context(audio.mmap())
 
         feedback_data = generate_feedback(
-            audio_file=audio_path,
+            audio_file=audio_source,
             user_answer=answer_text,
             interview_id=interview_id,
             question_index=question_index,
-            transcription_text=transcription_text
+            transcription_text=transcription_text,
+            on_stage=report_stage,
+            words=words,
+            speech_features=speech_features
         )
 
-        interview = db.interviews.find_one({"interview_id": interview_id})
-        sample_answer = ""
-        if interview and "sample_answers" in interview and len(interview["sample_answers"]) > question_index:
-            sample_answer = interview["sample_answers"][question_index]
+    interview = get_interview(interview_id, ("sample_answers",))
+    sample_answer = ((interview or {}).get("sample_answers") or [])[question_index:question_index + 1]
+    sample_answer = (sample_answer or [None])[0] or ""  # None while still being generated
 
-        question_feedback = {
-            "question_index": question_index,
-            "user_answer_text": answer_text,
-            "timestamp": datetime.utcnow().isoformat(),
-            "answer_duration_seconds": duration,
-            "feedback": feedback_data,
-            "overall_comments": feedback_data.get("overall_review"),
-            "sample_answer": sample_answer
-        }
+    question_feedback = {
+        "question_index": question_index,
+        "user_answer_text": answer_text,
+        "timestamp": datetime.utcnow().isoformat(),
+        "answer_duration_seconds": duration,
+        "feedback": feedback_data,
+        "overall_comments": feedback_data.get("overall_review"),
+        "sample_answer": sample_answer
+    }
 
-        existing_feedback = db.feedback_collection.find_one({"interview_id": interview_id, "user_id": user_id})
+    if attempt_number is None:
+        attempt_number = latest_attempt(interview_id, user_id)
+        if attempt_number is None:
+            raise RuntimeError("No active session found. Start interview session first.")
 
-        if existing_feedback:
-            attempts = existing_feedback.get("attempts", [])
+    if append_question_feedback(interview_id, user_id, attempt_number, question_feedback):
+        message = "Feedback analysis complete and saved."
+    elif has_attempt(interview_id, user_id, attempt_number):
+        message = "Feedback analysis complete; this question already has feedback in this attempt, so it was not saved again."
+    else:
+        raise RuntimeError(f"Attempt {attempt_number} not found. Start interview session first.")
 
-            if not attempts:
-                raise HTTPException(status_code=400, detail="No active session found. Start interview session first.")
+    return {"message": message, "attempt_number": attempt_number, "feedback": feedback_data}
 
-            latest_attempt = attempts[-1]
-            attempt_number = latest_attempt.get("attempt_number", 1)
 
-            question_attempted = any(
-                q["question_index"] == question_index for q in latest_attempt.get("questions_feedback", [])
-            )
+def _parse_word_timestamps(raw: str) -> Optional[list]:
+    """The words as /audio/process_audio/ returns them, or None unless raw has exactly that shape."""
+    try:
+        words = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(words, list):
+        return None
+    for word in words:
+        if not (isinstance(word, dict) and isinstance(word.get("word"), str)
+                and all(isinstance(word.get(key), (int, float)) and not isinstance(word.get(key), bool)
+                        for key in ("start", "end"))):
+            return None
+    return words
+
 
-            if not question_attempted:
-                latest_attempt["questions_feedback"].append(question_feedback)
-                db.feedback_collection.update_one(
-                    {"interview_id": interview_id, "user_id": user_id},
-                    {"$set": {"attempts": attempts}},
-                    upsert=True
+@router.post("/analyze-feedback/")
+async def analyze_and_save_feedback(
+    interview_id: str = Form(...),
+    question_index: int = Form(...),
+    answer_text: str = Form(...),
+    user_id: str = Form(...),
+    duration: float = Form(...),
+    audio: UploadFile = File(None),
+    transcription_text: Optional[str] = Form(None),
+    word_timestamps: Optional[str] = Form(None),
+    stream_id: Optional[str] = Form(None),
+    attempt_number: Optional[int] = Form(None)
+):
+    """
+    Queues feedback analysis for one answer and returns a job id to poll or stream. The feedback
+    goes to attempt_number, or to the latest attempt at the time of this request.
+    """
+    try:
+        if attempt_number is None:
+            attempt_number = await feedback_repository.latest_attempt(interview_id, user_id)
+            if attempt_number is None:
+                raise HTTPException(status_code=400, detail="No session found. Start interview session first.")
+        elif not await feedback_repository.has_attempt(interview_id, user_id, attempt_number):
+            raise HTTPException(status_code=400, detail=f"Attempt {attempt_number} not found. Start interview session first.")
+
+        # Word timestamps from /audio/process_audio/ (JSON list), reused for the speech rate
+        words = None
+        if word_timestamps:
+            words = _parse_word_timestamps(word_timestamps)
+            if words is None:
+                raise HTTPException(
+                    status_code=400, detail='word_timestamps must be a JSON list of {"word", "start", "end"} objects.'
                 )
 
-        else:
-            raise HTTPException(status_code=400, detail="No session found. Start interview session first.")
+        # Speech analysis already computed live over /audio/stream, if the answer was streamed
+        speech_features = claim_stream_result(stream_id) if stream_id else None
+        if stream_id and speech_features is None:
+            raise HTTPException(status_code=404, detail="Stream not found or expired.")
 
-        return JSONResponse(content={"message": "Feedback analysis complete and saved."}, status_code=200)
+        spooled_audio = None
+        try:
+            # Stream the audio to the upload spool in chunks if provided
+            spooled_audio = await run_in_threadpool(spool_upload, audio) if audio else None
+            job = feedback_jobs.submit(
+                process_answer_feedback,
+                interview_id, question_index, answer_text, user_id, duration, spooled_audio, transcription_text, words,
+                speech_features, attempt_number
+            )
+        except Exception:
+            # Not accepted (413/415 from the spool, full queue): keep the stream's analysis for a retry
+            if spooled_audio:
+                spooled_audio.cleanup()
+            if speech_features is not None:
+                release_stream_result(stream_id, speech_features)
+            raise
 
+        return JSONResponse(
+            content={
+                "message": "Feedback analysis queued.",
+                "job_id": job.id,
+                "attempt_number": attempt_number,
+                "status_url": f"/feedback/jobs/{job.id}",
+                "events_url": f"/feedback/jobs/{job.id}/events"
+            },
+            status_code=202
+        )
+
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Feedback processing failed: {str(e)}")
-    
+
+
+@router.get("/jobs/{job_id}")
+async def get_feedback_job(job_id: str):
+    """Returns the status, finished stages and (once done) the result of a feedback job."""
+    job = feedback_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(content=jsonable_encoder(job.to_dict()))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_feedback_job(job_id: str):
+    """Server-Sent Events stream with one event per finished stage, then a final status event."""
+    job = feedback_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job_event_response(job)
+
 @router.get("/feedback/{interview_id}")
-async def get_feedback(interview_id: str, user_id: str):
+async def get_feedback(interview_id: str, user_id: str, attempt_number: Optional[int] = None, include_details: bool = True):
+    """
+    Feedback of every attempt (or only attempt_number) with the question texts.
+    include_details=False leaves out the per-answer analysis and keeps the reviews.
+    """
     try:
         # Fetch feedback
-        existing_feedback = db.feedback_collection.find_one({
-            "interview_id": interview_id,
-            "user_id": user_id
-        })
-
-        if not existing_feedback:
+        attempts = await feedback_repository.list_feedback(interview_id, user_id, attempt_number, include_details)
+        if attempts is None:
             raise HTTPException(status_code=404, detail="No feedback found for the given interview and user")
 
         # Fetch interview questions
-        interview = db.interviews.find_one({"interview_id": interview_id})
+        interview = await interview_repository.get_cached(interview_id, ("questions",))
         if not interview:
             raise HTTPException(status_code=404, detail="Interview not found")
 
@@ -138,7 +227,7 @@ async def get_feedback(interview_id: str, user_id: str):
 
         # Prepare feedback data
         feedback_data = []
-        for attempt in existing_feedback.get("attempts", []):
+        for attempt in attempts:
             attempt_feedback = {
                 "attempt_number": attempt["attempt_number"],
                 "questions_feedback": []
@@ -148,20 +237,24 @@ async def get_feedback(interview_id: str, user_id: str):
                 q_index = q_feedback["question_index"]
                 question_text = questions_list[q_index] if q_index < len(questions_list) else "Question not found"
 
-                attempt_feedback["questions_feedback"].append({
+                question_data = {
                     "question_index": q_index,
                     "question_text": question_text,
                     "user_answer_text": q_feedback["user_answer_text"],
                     "timestamp": q_feedback["timestamp"],
                     "answer_duration_seconds": q_feedback["answer_duration_seconds"],
                     "overall_comments": q_feedback["overall_comments"],
-                    "sample_answer": q_feedback["sample_answer"],
-                    "feedback": q_feedback.get("feedback", "No feedback provided")
-                })
+                    "sample_answer": q_feedback["sample_answer"]
+                }
+                if include_details:
+                    question_data["feedback"] = q_feedback.get("feedback", "No feedback provided")
+                attempt_feedback["questions_feedback"].append(question_data)
 
             feedback_data.append(attempt_feedback)
 
         return JSONResponse(content={"feedback": feedback_data}, status_code=200)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve feedback: {str(e)}")
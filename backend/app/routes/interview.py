@@ -1,12 +1,61 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from app.repositories import interview_repository
 from app.services.nlp_service import process_resume, generate_questions,generate_answers_from_questions
+from app.services.embedding_service import embed_for_storage
+from app.services.interview_cache import CACHED_FIELDS, invalidate
+from app.services.job_queue import sample_answer_jobs, QueueFullError
+from app.services.resume_index import (
+    find_question_set, get_or_parse_resume, get_parsed_resume, question_set_key, store_answers, store_questions
+)
+from app.utils.resume_text import RESUME_MAX_BYTES
+from app.utils.sse import job_event_response
 from app.database import db
 import datetime
+import os
+from typing import Optional
 import uuid
 import json
 
+# Store and return the interview once questions exist; sample answers follow in the background
+PIPELINED_UPLOAD = os.getenv("PIPELINED_UPLOAD", "1") == "1"
+
 router = APIRouter()
 
+def fill_sample_answers(interview_id: str, questions: list, parsed_resume: dict, interview_type: str, difficulty_level: str,
+                        position: str, job_description: str, use_cache: bool = True, set_key: Optional[str] = None,
+                        report_stage=None):
+    """
+    Background job: writes each sample answer into the stored interview as soon as it is generated,
+    then their embeddings (for relevance scoring), then completes the reusable question set under set_key.
+    """
+    def store(index, answer):
+        db.interviews.update_one({"interview_id": interview_id}, {"$set": {f"sample_answers.{index}": answer}})
+        invalidate(interview_id)
+        if report_stage:
+            report_stage(f"sample_answer_{index}", {"index": index, "sample_answer": answer})
+
+    try:
+        answers = generate_answers_from_questions(
+            questions, parsed_resume, interview_type, difficulty_level, position, job_description,
+            use_cache=use_cache, on_answer=store
+        )
+    except Exception:
+        db.interviews.update_one({"interview_id": interview_id}, {"$set": {"sample_answers_status": "failed"}})
+        invalidate(interview_id)
+        raise
+    embeddings = embed_for_storage(answers)
+    db.interviews.update_one(
+        {"interview_id": interview_id},
+        {"$set": {"sample_answers_status": "ready", "sample_answer_embeddings": embeddings}}
+    )
+    invalidate(interview_id)
+    if set_key:
+        store_answers(set_key, questions, answers, embeddings)
+    return {"interview_id": interview_id, "sample_answers": answers}
+
 @router.post("/upload_resume")
 async def upload_resume(
     user_id: str = Form(...),
@@ -14,24 +63,63 @@ async def upload_resume(
     job_description: str = Form(...),
     interview_type: str = Form(...),
     difficulty_level: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    regenerate: bool = Form(False),
+    wait_for_answers: bool = Form(False)
 ):
-    """Uploads a resume, parses it in memory, and generates interview questions."""
+    """
+    Uploads a resume, parses it in memory, and generates interview questions.
+    A resume seen before (same bytes) is not parsed again, and the same resume, position, JD,
+    type and difficulty reuse the stored question set unless regenerate=True. The interview is
+    stored and returned as soon as the questions exist; sample answers are filled in by a
+    background job (follow answers_events_url, or poll the interview).
+    wait_for_answers=True (or PIPELINED_UPLOAD=0) waits for the answers before responding.
+    """
     
     # Ensure file is a valid format
     if not (file.filename.endswith(".pdf") or file.filename.endswith(".docx")):
         raise HTTPException(status_code=400, detail="Only PDF or DOCX files are allowed.")
 
+    if file.size is not None and file.size > RESUME_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Resume exceeds {RESUME_MAX_BYTES // (1024 * 1024)} MB.")
+
     # Read the file content in memory
     file_content = await file.read()
 
-    # Parse resume in memory
-    parsed_resume = process_resume(file_content, file.filename)
+    # Parse resume in memory (or reuse the stored parse of the same file)
+    resume_hash, parsed_resume = await run_in_threadpool(get_or_parse_resume, file_content, file.filename, process_resume)
+    # Questions generated from a failed parse are not stored for reuse (a later upload may parse)
+    set_key = None if "error" in parsed_resume else question_set_key(
+        resume_hash, position, job_description, interview_type, difficulty_level
+    )
+    question_set = None if regenerate or not set_key else await run_in_threadpool(find_question_set, set_key)
+
+    if question_set:
+        questions, answers = question_set["questions"], question_set.get("sample_answers")
+        embeddings = question_set.get("sample_answer_embeddings")
+    else:
+        # Generate questions
+        # regenerate=True bypasses the LLM cache so a retry gets a new question set
+        questions = await run_in_threadpool(
+            generate_questions, parsed_resume, interview_type, difficulty_level, position, job_description, use_cache=not regenerate
+        )
+        answers = embeddings = None
+        if set_key:
+            await run_in_threadpool(store_questions, set_key, questions)
+    answer_args = (questions, parsed_resume, interview_type, difficulty_level, position, job_description)
 
-    # Generate questions
-    questions = generate_questions(parsed_resume, interview_type, difficulty_level,position , job_description)
+    pipelined = PIPELINED_UPLOAD and not wait_for_answers and answers is None
+    if answers is not None:
+        answers_status = "ready"  # complete set reused
+    elif pipelined:
+        answers, answers_status = [None] * len(questions), "pending"
+    else:
+        answers = await run_in_threadpool(generate_answers_from_questions, *answer_args, use_cache=not regenerate)
+        answers_status = "ready"
+        embeddings = await run_in_threadpool(embed_for_storage, answers)
+        if set_key:
+            await run_in_threadpool(store_answers, set_key, questions, answers, embeddings)
 
-    answers = generate_answers_from_questions(questions, parsed_resume,interview_type, difficulty_level,position , job_description)
     # Generate unique interview ID
     interview_id = str(uuid.uuid4())
 
@@ -43,26 +131,66 @@ async def upload_resume(
         "job_description": job_description,
         "interview_type": interview_type,
         "difficulty_level": difficulty_level,
-        "parsed_resume": parsed_resume,
+        "resume_hash": resume_hash,  # parsed resume lives once in the resumes collection
         "questions": questions,
         "sample_answers": answers,
+        "sample_answers_status": answers_status,
+        "sample_answer_embeddings": embeddings,
         "created_at": datetime.datetime.utcnow().isoformat()
     }
 
-    db.interviews.insert_one(interview_data)
+    await interview_repository.insert(interview_data)
 
-    
-    print(interview_data)
-    return {"message": "Resume processed successfully!", "interview_id": interview_id, "questions": questions, "sample_answers":answers}
+    response = {
+        "message": "Resume processed successfully!",
+        "interview_id": interview_id,
+        "questions": questions,
+        "sample_answers": answers,
+        "sample_answers_status": answers_status,
+        "reused_question_set": question_set is not None
+    }
+    if pipelined:
+        try:
+            job = sample_answer_jobs.submit(fill_sample_answers, interview_id, *answer_args, use_cache=not regenerate, set_key=set_key)
+        except QueueFullError:
+            # Too busy to generate answers now, and the interview is already stored: return it
+            # without them (feedback then scores without a sample answer) rather than block or fail
+            await interview_repository.set_fields(interview_id, {"sample_answers_status": "failed"})
+            response["sample_answers_status"] = "failed"
+        else:
+            response["answers_job_id"] = job.id
+            response["answers_status_url"] = f"/interview/answer_jobs/{job.id}"
+            response["answers_events_url"] = f"/interview/answer_jobs/{job.id}/events"
+
+    print({key: value for key, value in interview_data.items() if key != "sample_answer_embeddings"})
+    return response
+
+@router.get("/answer_jobs/{job_id}")
+async def get_answer_job(job_id: str):
+    """Status and (once done) all sample answers of a background sample-answer job."""
+    job = sample_answer_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(content=jsonable_encoder(job.to_dict()))
+
+@router.get("/answer_jobs/{job_id}/events")
+async def stream_answer_job(job_id: str):
+    """Server-Sent Events stream with one stage event per sample answer as it is stored."""
+    job = sample_answer_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_event_response(job)
 @router.get("/get_interview_details/{interview_id}")
-def get_interview_details(interview_id: str):
-    interview = db.interviews.find_one({"interview_id": interview_id}, {"_id": 0})
+async def get_interview_details(interview_id: str):
+    interview = await interview_repository.get_cached(interview_id, CACHED_FIELDS)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
+    if "parsed_resume" not in interview and "resume_hash" in interview:
+        interview["parsed_resume"] = await run_in_threadpool(get_parsed_resume, interview["resume_hash"])
     return interview
 @router.get("/get_next_question/{interview_id}")
-def get_next_question(interview_id: str, index: int = Query(0, ge=0)):
-    interview = db.interviews.find_one({"interview_id": interview_id})
+async def get_next_question(interview_id: str, index: int = Query(0, ge=0)):
+    interview = await interview_repository.get_question(interview_id, index)
     if not interview or "questions" not in interview:
         raise HTTPException(status_code=404, detail="Interview or questions not found")
 
@@ -70,25 +198,34 @@ def get_next_question(interview_id: str, index: int = Query(0, ge=0)):
     if index >= len(questions):
         return {"message": "No more questions", "is_complete": True}
 
+    # Answers may still be generating in the background (pipelined upload)
+    sample_answer = (interview.get("sample_answers") or [None])[0]
+    if sample_answer is not None:
+        sample_answer_status = "ready"
+    elif interview.get("sample_answers_status") == "pending":
+        sample_answer_status = "pending"
+    else:
+        sample_answer_status = "unavailable"
+
     return {
         "question_number": index + 1,
         "question": questions[index],
+        "sample_answer_status": sample_answer_status,
         "is_complete": False
     }
 @router.get("/get_questions/{interview_id}")
-def get_all_questions(interview_id: str):
-    interview = db.interviews.find_one({"interview_id": interview_id}, {"_id": 0, "questions": 1})
+async def get_all_questions(interview_id: str):
+    interview = await interview_repository.get_cached(interview_id, ("questions",))
     if not interview or "questions" not in interview:
         raise HTTPException(status_code=404, detail="Interview or questions not found")
     return {"questions": interview["questions"]}
 
 
 @router.get("/user_interviews")
-def get_user_interviews(user_id: str = Query(...)):
-    interviews_cursor = db.interviews.find(
-        {"user_id": user_id},
+async def get_user_interviews(user_id: str = Query(...)):
+    interviews = await interview_repository.list_for_user(
+        user_id,
         {
-            "_id": 0,
             "interview_id": 1,
             "position": 1,
             "interview_type": 1,
@@ -96,7 +233,6 @@ def get_user_interviews(user_id: str = Query(...)):
             "created_at": 1
         }
     )
-    interviews = list(interviews_cursor)
     if not interviews:
         raise HTTPException(status_code=404, detail="No interviews found for this user")
     return {"interviews": interviews}
\ No newline at end of file
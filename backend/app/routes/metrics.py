@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from app.services.interview_cache import interview_cache
+from app.services.llm_cache import llm_cache
+from app.services.llm_gateway import llm_gateway
+from app.services.model_registry import registry
+
+router = APIRouter()
+
+@router.get("/models")
+def model_metrics():
+    """Load time, RSS growth and loaded/remote state for every registered model."""
+    return registry.stats()
+
+@router.get("/llm_cache")
+def llm_cache_metrics():
+    """Hit/miss counters of the Gemini response cache."""
+    return llm_cache.stats()
+
+@router.get("/llm")
+def llm_metrics():
+    """Per-call-site Gemini latency histograms, retries, coalesced calls and time spent rate limited."""
+    return llm_gateway.stats()
+
+@router.get("/grammar")
+def grammar_metrics():
+    """LanguageTool pool usage, batching, load shedding and per-engine check latency."""
+    checker = registry.get_loaded("grammar_tool")
+    return checker.stats() if checker is not None else {"loaded": False}
+
+@router.get("/emotion")
+def emotion_metrics():
+    """Windows classified, share of audio that was voiced, batching and inference latency of the emotion model."""
+    # Reading metrics must not load wav2vec2 into a process that never analyses audio
+    recognizer = registry.get_loaded("emotion_classifier")
+    return recognizer.stats() if recognizer is not None else {"loaded": False}
+
+@router.get("/interview_cache")
+def interview_cache_metrics():
+    """Hit rate, evictions, expirations and invalidations of this process's interview document cache."""
+    return interview_cache.stats()
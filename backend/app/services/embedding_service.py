@@ -0,0 +1,63 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from app.services.model_registry import registry
+from app.utils.micro_batch import MicroBatcher
+
+# === Embedding settings ===
+# "local": relevance from sentence embeddings, depth from a heuristic; "llm": ask Gemini for both
+SCORING_ENGINE = os.getenv("SCORING_ENGINE", "local")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "10"))
+# Cosine similarities at or below the floor score 0, at or above the ceiling score 1. MiniLM puts
+# unrelated answers around 0.1-0.2 and paraphrases of the same answer around 0.8-0.9.
+RELEVANCE_COSINE_FLOOR = float(os.getenv("RELEVANCE_COSINE_FLOOR", "0.15"))
+RELEVANCE_COSINE_CEILING = float(os.getenv("RELEVANCE_COSINE_CEILING", "0.85"))
+
+
+def _encode_batch(texts: List[str]) -> List[np.ndarray]:
+    vectors = registry.get("sentence_encoder").encode(
+        texts, batch_size=EMBEDDING_BATCH_SIZE, normalize_embeddings=True, convert_to_numpy=True
+    )
+    return [np.asarray(vector, dtype=np.float32) for vector in vectors]
+
+
+embedding_batcher = MicroBatcher(_encode_batch, EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_WAIT_MS, name="embedding-batcher")
+
+
+def encode(texts: List[str]) -> List[np.ndarray]:
+    """Unit-length float32 embeddings; concurrent callers share encoder batches."""
+    futures = [embedding_batcher.submit_future(text or "") for text in texts]
+    return [future.result() for future in futures]
+
+
+def to_bytes(vector: np.ndarray) -> bytes:
+    """Compact storage form (float32 bytes, 1.5 KB for MiniLM) for Mongo documents."""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_bytes(data: Optional[bytes]) -> Optional[np.ndarray]:
+    return np.frombuffer(data, dtype=np.float32) if data else None
+
+
+def embed_for_storage(texts: List[str]) -> Optional[List[bytes]]:
+    """
+    Stored embeddings of the sample answers, computed once at upload so feedback only encodes
+    the transcript. None when the local engine is off or the encoder fails to load.
+    """
+    if SCORING_ENGINE != "local" or not texts:
+        return None
+    try:
+        return [to_bytes(vector) for vector in encode(texts)]
+    except Exception as e:
+        print(f"Skipping sample answer embeddings: {e}")
+        return None
+
+
+def relevance(answer_vector: np.ndarray, sample_vector: np.ndarray) -> float:
+    """Cosine similarity of two unit vectors, mapped onto 0-1 between the floor and ceiling."""
+    cosine = float(np.dot(answer_vector, sample_vector))
+    scaled = (cosine - RELEVANCE_COSINE_FLOOR) / (RELEVANCE_COSINE_CEILING - RELEVANCE_COSINE_FLOOR)
+    return float(np.clip(scaled, 0.0, 1.0))
@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from app.utils import vad
+from app.utils.latency import LatencyHistogram
+from app.utils.micro_batch import MicroBatcher
+
+# === Emotion settings ===
+EMOTION_MODEL = os.getenv("EMOTION_MODEL", "speechbrain/emotion-recognition-wav2vec2-IEMOCAP")
+# Int8 dynamic quantization of the Linear layers (wav2vec2's projections and feed-forwards) for CPU
+EMOTION_QUANTIZE = os.getenv("EMOTION_QUANTIZE", "0") == "1"
+# Voiced speech is cut into windows of this length; shorter leftovers are kept if above the minimum
+EMOTION_WINDOW_SECONDS = float(os.getenv("EMOTION_WINDOW_SECONDS", "4"))
+EMOTION_MIN_WINDOW_SECONDS = float(os.getenv("EMOTION_MIN_WINDOW_SECONDS", "1"))
+# Silences shorter than this stay inside a voiced region (breaths, stop consonants)
+EMOTION_MERGE_GAP_SECONDS = float(os.getenv("EMOTION_MERGE_GAP_SECONDS", "0.3"))
+# Long answers are classified on this many windows spread evenly over the recording
+EMOTION_MAX_WINDOWS = int(os.getenv("EMOTION_MAX_WINDOWS", "12"))
+EMOTION_BATCH_SIZE = int(os.getenv("EMOTION_BATCH_SIZE", "16"))
+EMOTION_BATCH_WAIT_MS = float(os.getenv("EMOTION_BATCH_WAIT_MS", "20"))
+EMOTION_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+EMOTION_NOT_ANALYZED = "not analyzed"
+# IEMOCAP label codes as the classifier emits them
+EMOTION_NAMES = {"neu": "neutral", "hap": "happy", "ang": "angry", "sad": "sad"}
+
+
+def _load_speechbrain_classifier(quantize: bool):
+    from speechbrain.inference.interfaces import foreign_class
+    classifier = foreign_class(
+        source=EMOTION_MODEL,
+        pymodule_file="custom_interface.py",
+        classname="CustomEncoderWav2vec2Classifier"
+    )
+    if quantize:
+        import torch
+        classifier.mods = torch.quantization.quantize_dynamic(classifier.mods, {torch.nn.Linear}, dtype=torch.qint8)
+    return classifier
+
+
+def voiced_windows(samples: np.ndarray, sample_rate: int) -> List[tuple]:
+    """
+    (start, end) sample ranges of the voiced parts of a recording, cut into windows of at most
+    EMOTION_WINDOW_SECONDS. Silence is located with the same energy VAD as the pause analysis.
+    """
+    duration = len(samples) / sample_rate
+    if not len(samples):
+        return []
+    silences = vad.silence_intervals(samples, sample_rate)
+    silences = silences[silences[:, 1] - silences[:, 0] >= EMOTION_MERGE_GAP_SECONDS]
+    # Voiced regions are the gaps between the remaining silences
+    bounds = np.concatenate(([0.0], silences.ravel(), [duration])).reshape(-1, 2)
+    windows = []
+    for start, end in bounds:
+        position = start
+        while end - position >= EMOTION_MIN_WINDOW_SECONDS:
+            stop = min(end, position + EMOTION_WINDOW_SECONDS)
+            windows.append((int(position * sample_rate), int(stop * sample_rate)))
+            position = stop
+    if len(windows) > EMOTION_MAX_WINDOWS:
+        keep = np.linspace(0, len(windows) - 1, EMOTION_MAX_WINDOWS).round().astype(int)
+        windows = [windows[index] for index in keep]
+    return windows
+
+
+class EmotionRecognizer:
+    """
+    Speech emotion over the voiced windows of an answer instead of the whole recording. Windows
+    from concurrent answers are micro-batched into one padded forward pass of the wav2vec2 model,
+    and per-window probabilities are averaged (weighted by window length) into the dominant
+    emotion, with the per-window labels kept as a timeline. Inputs and results are plain arrays
+    and dicts, so it also runs behind the model-server proxy.
+    """
+
+    def __init__(self, quantize: bool = EMOTION_QUANTIZE):
+        self.quantize = quantize
+        self._classifier = None
+        self._load_lock = threading.Lock()
+        self._batcher = MicroBatcher(self._classify_batch, EMOTION_BATCH_SIZE, EMOTION_BATCH_WAIT_MS, name="emotion-batcher")
+        self._latency = LatencyHistogram(EMOTION_LATENCY_BUCKETS)
+        self.windows_classified = 0
+        self.seconds_classified = 0.0
+        self.seconds_received = 0.0
+
+    def _model(self):
+        if self._classifier is None:
+            with self._load_lock:
+                if self._classifier is None:
+                    self._classifier = _load_speechbrain_classifier(self.quantize)
+        return self._classifier
+
+    def labels(self) -> List[str]:
+        encoder = self._model().hparams.label_encoder
+        return [encoder.ind2lab[index] for index in range(len(encoder.ind2lab))]
+
+    def _classify_batch(self, windows: List[np.ndarray]) -> List[np.ndarray]:
+        import torch
+        classifier = self._model()
+        longest = max(len(window) for window in windows)
+        wavs = torch.zeros(len(windows), longest)
+        for row, window in enumerate(windows):
+            wavs[row, :len(window)] = torch.from_numpy(window)
+        wav_lens = torch.tensor([len(window) / longest for window in windows])
+        with torch.inference_mode():
+            out_prob, _, _, _ = classifier.classify_batch(wavs, wav_lens)
+        probabilities = out_prob.float()
+        if probabilities.max() <= 0:  # log-probabilities
+            probabilities = probabilities.exp()
+        probabilities = probabilities / probabilities.sum(dim=-1, keepdim=True)
+        return list(probabilities.numpy())
+
+    def analyze(self, samples: np.ndarray, sample_rate: int) -> dict:
+        """{"dominant_emotion", "emotion_probabilities", "emotion_timeline"} of a mono recording."""
+        samples = np.asarray(samples, dtype=np.float32)
+        windows = voiced_windows(samples, sample_rate)
+        self.seconds_received += len(samples) / sample_rate
+        if not windows:
+            return {"dominant_emotion": EMOTION_NOT_ANALYZED, "emotion_probabilities": {}, "emotion_timeline": []}
+
+        start = time.perf_counter()
+        futures = [self._batcher.submit_future(samples[begin:end]) for begin, end in windows]
+        try:
+            probabilities = np.stack([future.result() for future in futures])
+        except Exception:
+            self._latency.observe(time.perf_counter() - start, failed=True)
+            raise
+        self._latency.observe(time.perf_counter() - start)
+
+        lengths = np.array([end - begin for begin, end in windows], dtype=np.float64)
+        self.windows_classified += len(windows)
+        self.seconds_classified += float(lengths.sum()) / sample_rate
+        labels = [EMOTION_NAMES.get(label, label) for label in self.labels()]
+        overall = (probabilities * lengths[:, None]).sum(axis=0) / lengths.sum()
+        return {
+            "dominant_emotion": labels[int(overall.argmax())],
+            "emotion_probabilities": {label: round(float(p), 3) for label, p in zip(labels, overall)},
+            "emotion_timeline": [
+                {
+                    "start": round(begin / sample_rate, 2),
+                    "end": round(end / sample_rate, 2),
+                    "emotion": labels[int(row.argmax())],
+                    "confidence": round(float(row.max()), 3),
+                }
+                for (begin, end), row in zip(windows, probabilities)
+            ],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "model": EMOTION_MODEL,
+            "quantized": self.quantize,
+            "windows_classified": self.windows_classified,
+            # Share of the received audio actually run through the model
+            "voiced_fraction": round(self.seconds_classified / self.seconds_received, 3) if self.seconds_received else None,
+            "batching": self._batcher.stats(),
+            "latency": self._latency.snapshot(),
+        }
@@ -0,0 +1,81 @@
+"""
+Copies feedback from the embedded layout (one feedback_collection document per interview and
+user) into the per-question layout (feedback_sessions + question_feedback):
+
+    python -m app.services.feedback_migration [--dry-run] [--batch-size 500]
+
+Idempotent: an answer is only inserted when its unique key is missing (one already in the new
+layout is never overwritten) and session counters only move up, so it can be re-run. Cut-over:
+run it once while the embedded layout serves, then pause feedback writes, run it again to pick
+up what was saved meanwhile, switch to FEEDBACK_SCHEMA=per_question and resume. Without the
+pause, attempts started between the final run and the switch are missing from the counters and
+new attempts reuse their numbers. The source documents are left in place; drop
+feedback_collection once the new layout is serving.
+"""
+import argparse
+
+from pymongo import UpdateOne
+
+from app.services import feedback_store
+from app.services.feedback_store import QUESTION_FEEDBACK_KEY
+
+
+def _flush(operations: list, sessions: list, dry_run: bool, counts: dict):
+    if dry_run:
+        return
+    if operations:
+        result = feedback_store.question_feedback_collection.bulk_write(operations, ordered=False)
+        counts["answers_already_present"] += result.matched_count
+    if sessions:
+        feedback_store.feedback_sessions_collection.bulk_write(sessions, ordered=False)
+
+
+def migrate(dry_run: bool = False, batch_size: int = 500) -> dict:
+    if not dry_run:
+        feedback_store._ensure_indexes()
+    counts = {"sessions": 0, "attempts": 0, "answers": 0, "duplicates_skipped": 0, "answers_already_present": 0}
+    operations, sessions = [], []
+    for document in feedback_store.feedback_collection.find({}, {"_id": 0}, batch_size=50):
+        interview_id, user_id = document["interview_id"], document["user_id"]
+        attempts = document.get("attempts", [])
+        attempt_count = max([document.get("attempt_count") or 0] + [attempt["attempt_number"] for attempt in attempts])
+        sessions.append(UpdateOne(
+            {"interview_id": interview_id, "user_id": user_id},
+            {"$max": {"attempt_count": attempt_count}},
+            upsert=True
+        ))
+        counts["sessions"] += 1
+        for attempt in attempts:
+            counts["attempts"] += 1
+            seen = set()
+            for question in attempt.get("questions_feedback", []):
+                # The legacy read-modify-write could store an answer twice; keep the first
+                if question["question_index"] in seen:
+                    counts["duplicates_skipped"] += 1
+                    continue
+                seen.add(question["question_index"])
+                row = {"user_id": user_id, "interview_id": interview_id, "attempt_number": attempt["attempt_number"], **question}
+                key = {field: row[field] for field in QUESTION_FEEDBACK_KEY}
+                # $setOnInsert: an answer the new layout already holds is left as it is
+                operations.append(UpdateOne(
+                    key, {"$setOnInsert": {field: value for field, value in row.items() if field not in key}}, upsert=True
+                ))
+                counts["answers"] += 1
+        if len(operations) >= batch_size or len(sessions) >= batch_size:
+            _flush(operations, sessions, dry_run, counts)
+            operations, sessions = [], []
+    _flush(operations, sessions, dry_run, counts)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy embedded feedback into per-question documents.")
+    parser.add_argument("--dry-run", action="store_true", help="count what would be copied without writing")
+    parser.add_argument("--batch-size", type=int, default=500, help="writes per bulk request")
+    args = parser.parse_args()
+    counts = migrate(args.dry_run, args.batch_size)
+    print(f"{'Would copy' if args.dry_run else 'Copied'}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,143 +1,214 @@
-import os 
-import numpy as np
-import torch
-import librosa
-import torchaudio
-import language_tool_python
-from sentence_transformers import SentenceTransformer, util
-from transformers import pipeline
-import google.generativeai as genai
-from faster_whisper import WhisperModel  # Import Whisper for transcription
-from speechbrain.inference.interfaces import foreign_class
 from app.models.interview import InterviewSession
 from app.database import db
-from typing import Optional
-# === Configure Gemini ===
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))  # Use .env for security
-gemini_model = genai.GenerativeModel("gemini-1.5-flash")
-
-# === Load NLP Models ===
-grammar_tool = language_tool_python.LanguageTool('en-US')
-
-# === Load Speechbrain Models ===
-whisper_model = WhisperModel("base")  # Use "medium" or "large" if needed
-classifier = foreign_class(
-    source="speechbrain/emotion-recognition-wav2vec2-IEMOCAP",
-    pymodule_file="custom_interface.py",
-    classname="CustomEncoderWav2vec2Classifier"
-)
-
-def generate_feedback( audio_file: str, user_answer: str, interview_id: str, question_index: int,transcription_text: Optional[str] = None):
+from app.services.llm_gateway import llm_gateway
+from app.services.emotion_service import EMOTION_NOT_ANALYZED
+from app.services.embedding_service import SCORING_ENGINE, encode, from_bytes, relevance
+from app.services.interview_cache import get_interview
+from app.services.model_registry import registry
+from app.utils.answer_depth import technical_depth
+from app.utils.audio_buffer import AudioBuffer, load_audio
+from app.utils.disfluency import detect_disfluencies
+from app.utils.speech_analysis import analyze_speech_signal
+from app.utils.stage_graph import StageGraph
+from typing import Callable, List, Optional
+import os
+import time
+
+# Gemini calls go through the LLM gateway (app/services/llm_gateway.py); LanguageTool and the
+# SpeechBrain emotion model are loaded lazily through the model registry (see app/services/model_registry.py).
+
+# Stages whose results are surfaced to job listeners
+REPORTED_STAGES = ("audio", "text", "review")
+# How long feedback waits for a sample answer that is still being generated
+SAMPLE_ANSWER_WAIT_SECONDS = float(os.getenv("SAMPLE_ANSWER_WAIT_SECONDS", "30"))
+SAMPLE_ANSWER_POLL_SECONDS = 0.5
+SAMPLE_ANSWER_NOT_FOUND = "Sample answer not found."
+
+def generate_feedback( audio_file: str, user_answer: str, interview_id: str, question_index: int,transcription_text: Optional[str] = None,
+                       on_stage: Optional[Callable[[str, dict], None]] = None, words: Optional[List[dict]] = None,
+                       speech_features: Optional[dict] = None):
+    """
+    Runs the feedback pipeline as a stage graph: the sample-answer lookup, the audio DSP
+    (worker process), emotion detection, filler/disfluency detection and the grammar/relevance/depth checks run concurrently,
+    and only the final review waits for them. Each finished REPORTED_STAGES entry is passed to on_stage.
+    words are the word timestamps from /audio/process_audio/, reused for the speech rate.
+    speech_features is the analysis already computed live over /audio/stream; when given, the
+    audio DSP is skipped and the file (if any) is only decoded for emotion detection.
+    """
     try:
-        # 1. Get Sample Answer from DB
-        sample_answer = get_sample_answer(interview_id, question_index)
-
-        # 2. Audio Analysis (speech speed, pauses, pitch, etc.)
-        audio_features = analyze_audio_features(audio_file, transcription_text)
-
-        # 3. Text Analysis
-        text_features = analyze_text_features(transcription_text, user_answer, sample_answer)
-
-        # 4. Combine Context for Gemini
-        context_data = {
-            "transcript": transcription_text,
-            "audio_analysis": audio_features,
-            "text_analysis": text_features,
-        }
-
-        msg = (
-            f"Context = {context_data} \n"
-            "The above context represents the data of an interviewee. "
-            "Please write a 500-700 word review neatly for him/her, providing suggestions for areas of improvement based on the above context."
-            "\nIMPORTANT : PLEASE FOLLOW THE BELOW RULES\n"
-            "RULE 1: Write the review as if you are directly TALKING WITH HIM/HER."
-            "RULE 2: Don't write anything extra, only write the review."
-            "RULE 3: Dont include any main headings such as 'review', use side-headings for explaining."
-            "RULE 4: If emotion analysis data is present then USE that for review also."
-            "RULE 5: This review is for an interview given in an website where anyone take mock interviews,"
-            "so write review based on that, but dont tell hi,thank u and all."
-        )
-
-        response = gemini_model.generate_content(msg)
-        final_review = response.text
+        graph = StageGraph()
+        graph.add("sample_answer", get_sample_answer, interview_id, question_index)
+
+        # Audio Analysis (speech speed, pauses, pitch, emotion) on a single decode of the file
+        if audio_file:
+            graph.add("audio_buffer", load_audio, audio_file)
+            graph.add("emotion", detect_emotion, deps=("audio_buffer",))
+        else:
+            graph.add("emotion", dict, dominant_emotion=EMOTION_NOT_ANALYZED, pool="inline")
+        if speech_features is not None:
+            graph.add("speech", dict, speech_features, pool="inline")
+        elif not audio_file:
+            graph.add("speech", dict, pool="inline")  # typed answer: nothing to analyze
+        else:
+            graph.add("speech", analyze_speech_signal, transcript=transcription_text, words=words, deps=("audio_buffer",), pool="process")
+        graph.add("disfluency", detect_disfluencies, transcription_text, words)
+        graph.add("audio", combine_audio_features, deps=("speech", "emotion", "disfluency"), pool="inline")
+
+        # Text Analysis
+        graph.add("grammar", check_grammar, transcription_text)
+        # Stored once all answers exist; read after the answer itself so a pending one is awaited first
+        graph.add("sample_embedding", get_sample_answer_embedding, interview_id, question_index, deps=("sample_answer",))
+        graph.add("relevance", score_relevance, transcription_text, deps=("sample_answer", "sample_embedding"))
+        graph.add("depth", score_technical_depth, transcription_text)
+        graph.add("text", combine_text_features, deps=("grammar", "relevance", "depth"), pool="inline")
+
+        # Final review needs everything above
+        graph.add("review", write_review, transcription_text, deps=("audio", "text"))
+
+        def report(stage, result):
+            if on_stage and stage in REPORTED_STAGES:
+                on_stage(stage, result)
+
+        results, timings = graph.run(on_stage=report)
+        print(f"Feedback stage timings (s): {timings}")
 
         return {
-            "speech_analysis": audio_features,
-            "text_analysis": text_features,
-            "overall_review": final_review
+            "speech_analysis": results["audio"],
+            "text_analysis": results["text"],
+            "overall_review": results["review"]["overall_review"],
+            "stage_timings": timings
         }
 
     except Exception as e:
         print(f"Error in feedback generation: {e}")
         return {"error": str(e)}
 
-def get_sample_answer(interview_id: str, question_index: int):
-    interview = db.interviews.find_one({"interview_id": interview_id})
-    if interview and "sample_answers" in interview and len(interview["sample_answers"]) > question_index:
-        return interview["sample_answers"][question_index]
-    return "Sample answer not found."
-
-def analyze_audio_features(audio_file: str, transcript: str):
-    waveform, sr = librosa.load(audio_file, sr=16000)
-    total_words = len(transcript.split())
-    duration = librosa.get_duration(y=waveform, sr=sr)
-    wpm = round((total_words / duration) * 60)
-
-    segments, _ = torchaudio.load(audio_file)
-    if segments.shape[0] > 1:
-        segments = torch.mean(segments, dim=0, keepdim=True)
-
-    # Pause calculation
-    pauses = []
-    try:
-        timestamps = [i / sr for i in range(0, len(waveform), sr // 2)]
-        pauses = [timestamps[i + 1] - timestamps[i] for i in range(len(timestamps) - 1)]
-    except Exception:
-        pauses = []
-
-    pause_count = sum(1 for p in pauses if p > 0.5)
-    hesitation_duration = sum(p for p in pauses if p > 0.5)
-
-    # Pitch
-    f0, _, _ = librosa.pyin(waveform, fmin=librosa.note_to_hz('C2'), fmax=librosa.note_to_hz('C7'))
-    pitch_variability = np.nanstd(f0)
-    tone_stability = 1 - (np.nanstd(np.diff(f0[np.isfinite(f0)])) if np.count_nonzero(np.isfinite(f0)) > 1 else 0)
+def write_review(transcript: str, audio: dict, text: dict):
+    # Combine Context for Gemini
+    context_data = {
+        "transcript": transcript,
+        "audio_analysis": audio,
+        "text_analysis": text,
+    }
 
-    # Emotion Detection using SpeechBrain's Wav2Vec2 model
-    emotion_prob, emotion_score, emotion_index, emotion_label = classifier.classify_file(audio_file)
+    msg = (
+        f"Context = {context_data} \n"
+        "The above context represents the data of an interviewee. "
+        "Please write a 500-700 word review neatly for him/her, providing suggestions for areas of improvement based on the above context."
+        "\nIMPORTANT : PLEASE FOLLOW THE BELOW RULES\n"
+        "RULE 1: Write the review as if you are directly TALKING WITH HIM/HER."
+        "RULE 2: Don't write anything extra, only write the review."
+        "RULE 3: Dont include any main headings such as 'review', use side-headings for explaining."
+        "RULE 4: If emotion analysis data is present then USE that for review also."
+        "RULE 5: This review is for an interview given in an website where anyone take mock interviews,"
+        "so write review based on that, but dont tell hi,thank u and all."
+    )
+
+    return {"overall_review": llm_gateway.generate(msg, site="feedback.review")}
+
+def get_sample_answer(interview_id: str, question_index: int, wait_seconds: float = SAMPLE_ANSWER_WAIT_SECONDS):
+    """
+    The stored sample answer for the question. After a pipelined upload it may still be generating,
+    so a pending answer is polled for up to wait_seconds before giving up.
+    """
+    deadline = time.monotonic() + wait_seconds
+    # First read through the interview cache; polls of a pending document read just the one answer
+    interview = get_interview(interview_id, ("sample_answers", "sample_answers_status"))
+    if interview and "sample_answers" in interview:
+        interview["sample_answers"] = interview["sample_answers"][question_index:question_index + 1]
+    while True:
+        answer = (interview.get("sample_answers") or [None])[0] if interview else None
+        if answer is not None:
+            return answer
+        if not interview or interview.get("sample_answers_status") != "pending" or time.monotonic() >= deadline:
+            return SAMPLE_ANSWER_NOT_FOUND
+        time.sleep(SAMPLE_ANSWER_POLL_SECONDS)
+        interview = db.interviews.find_one(
+            {"interview_id": interview_id},
+            {"_id": 0, "sample_answers": {"$slice": [question_index, 1]}, "sample_answers_status": 1}
+        )
 
+def detect_emotion(audio_buffer: AudioBuffer):
+    # Emotion Detection using SpeechBrain's Wav2Vec2 model on the voiced windows of the shared buffer (no re-decode)
+    return registry.get("emotion_classifier").analyze(audio_buffer.samples, audio_buffer.sample_rate)
+
+def combine_audio_features(speech: dict, emotion: dict, disfluency: dict):
+    # Confidence: mostly fluency (fillers, repetitions, false starts), partly pauses when audio was analyzed
+    clarity = speech.get("clarity_score")
+    fluency = disfluency["fluency_score"]
+    confidence = fluency if clarity is None else 0.7 * fluency + 0.3 * clarity
+    comments = ["Focus on reducing unnecessary pauses and maintaining a consistent tone."]
+    if disfluency["filler_word_count"]:
+        comments.append(f"Filler words used {disfluency['filler_word_count']} times ({', '.join(disfluency['filler_words_list'])}).")
+    if disfluency["repetition_count"] or disfluency["false_start_count"]:
+        comments.append(f"{disfluency['repetition_count']} repeated words and {disfluency['false_start_count']} false starts.")
     return {
-        "clarity_score": round(1 - (pause_count) / (total_words + 1), 2),
-        "speech_speed_wpm": wpm,
-        "pause_count": pause_count,
-        "hesitation_duration_seconds": round(hesitation_duration, 2),
-        "pitch_variability": round(pitch_variability, 2) if not np.isnan(pitch_variability) else 0.0,
-        "tone_stability": round(tone_stability, 2),
-        "dominant_emotion": emotion_label,
-        "comments": "Focus on reducing unnecessary pauses and maintaining a consistent tone."
+        **speech,
+        **disfluency,
+        **emotion,
+        "confidence_score": round(confidence, 2),
+        "comments": " ".join(comments)
     }
 
-def analyze_text_features(transcript: str, user_answer: str, sample_answer: str):
-    grammar_matches = grammar_tool.check(transcript)
+def analyze_audio_features(audio_file: str, transcript: str):
+    """Sequential audio analysis, for callers outside the stage graph."""
+    audio = load_audio(audio_file)
+    return combine_audio_features(analyze_speech_signal(audio, transcript), detect_emotion(audio), detect_disfluencies(transcript))
+
+def check_grammar(transcript: str):
+    grammar_matches = registry.get("grammar_tool").check(transcript)
     grammar_score = max(0, 1 - len(grammar_matches) / (len(transcript.split()) + 1))
+    return {
+        "grammar_score": round(grammar_score, 2),
+        "grammar_comments": [m["message"] for m in grammar_matches[:3]] if grammar_matches else ["No grammar issues detected."]
+    }
 
+def get_sample_answer_embedding(interview_id: str, question_index: int, sample_answer: str = None):
+    """The sample answer's embedding precomputed at upload, or None (then it is encoded on demand)."""
+    if SCORING_ENGINE != "local":
+        return None
+    interview = db.interviews.find_one(
+        {"interview_id": interview_id},
+        {"_id": 0, "sample_answer_embeddings": {"$slice": [question_index, 1]}}
+    )
+    stored = (interview.get("sample_answer_embeddings") or [None])[0] if interview else None
+    return from_bytes(stored)
+
+def _ask_score(prompt: str, site: str) -> float:
+    """Asks Gemini for a 0-1 score and parses the first token, falling back to 0.5."""
     try:
-        relevance_prompt = f"On a scale of 0 to 1, how relevant is the following answer to the expected one?\nUser Answer: {transcript}\nSample Answer: {sample_answer}"
-        depth_prompt = f"On a scale of 0 to 1, rate the technical depth of this answer:\n{transcript}"
-
-        relevance_response = gemini_model.generate_content(relevance_prompt)
-        depth_response = gemini_model.generate_content(depth_prompt)
-
-        relevance_score = float(relevance_response.text.strip().split()[0])
-        technical_depth_score = float(depth_response.text.strip().split()[0])
-
+        return float(llm_gateway.generate(prompt, site=site).strip().split()[0])
     except Exception:
-        relevance_score = 0.5
-        technical_depth_score = 0.5
-
+        return 0.5
+
+def score_relevance(transcript: str, sample_answer: str, sample_embedding=None):
+    """Embedding similarity to the sample answer (SCORING_ENGINE=local) or a Gemini rating."""
+    if SCORING_ENGINE != "local":
+        return _ask_score(f"On a scale of 0 to 1, how relevant is the following answer to the expected one?\nUser Answer: {transcript}\nSample Answer: {sample_answer}", "feedback.relevance")
+    if not transcript or not sample_answer or sample_answer == SAMPLE_ANSWER_NOT_FOUND:
+        return 0.5  # nothing to compare against
+    if sample_embedding is None:
+        answer_vector, sample_embedding = encode([transcript, sample_answer])
+    else:
+        answer_vector, = encode([transcript])
+        if sample_embedding.shape != answer_vector.shape:
+            # Stored under a previous EMBEDDING_MODEL; encode the sample answer with the current one
+            sample_embedding, = encode([sample_answer])
+    return relevance(answer_vector, sample_embedding)
+
+def score_technical_depth(transcript: str):
+    if SCORING_ENGINE != "local":
+        return _ask_score(f"On a scale of 0 to 1, rate the technical depth of this answer:\n{transcript}", "feedback.depth")
+    return technical_depth(transcript)
+
+def combine_text_features(grammar: dict, relevance: float, depth: float):
     return {
-        "grammar_score": round(grammar_score, 2),
-        "relevance_score": round(relevance_score, 2),
-        "technical_depth_score": round(technical_depth_score, 2),
-        "grammar_comments": [m.message for m in grammar_matches[:3]] if grammar_matches else ["No grammar issues detected."]
-    }
\ No newline at end of file
+        "grammar_score": grammar["grammar_score"],
+        "relevance_score": round(relevance, 2),
+        "technical_depth_score": round(depth, 2),
+        "grammar_comments": grammar["grammar_comments"]
+    }
+
+def analyze_text_features(transcript: str, user_answer: str, sample_answer: str):
+    """Sequential text analysis, for callers outside the stage graph."""
+    return combine_text_features(check_grammar(transcript), score_relevance(transcript, sample_answer), score_technical_depth(transcript))
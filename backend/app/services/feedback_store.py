@@ -0,0 +1,198 @@
+import os
+from typing import List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.database import db
+
+# === Feedback storage settings ===
+# "embedded": one document per (interview_id, user_id) holding every attempt and answer;
+# "per_question": one document per answered question plus a small session counter
+# (move existing data with python -m app.services.feedback_migration first; see its cut-over steps)
+FEEDBACK_SCHEMA = os.getenv("FEEDBACK_SCHEMA", "embedded")
+
+# Embedded layout: {"attempt_count", "attempts": [{"attempt_number", "questions_feedback": [...]}]}
+feedback_collection = db["feedback_collection"]
+# Per-question layout: {"interview_id", "user_id", "attempt_count"} and one document per
+# (user_id, interview_id, attempt_number, question_index) with that question's feedback
+feedback_sessions_collection = db["feedback_sessions"]
+question_feedback_collection = db["question_feedback"]
+QUESTION_FEEDBACK_KEY = ("user_id", "interview_id", "attempt_number", "question_index")
+
+_indexed = False
+
+
+def _ensure_indexes():
+    global _indexed
+    if not _indexed:
+        feedback_sessions_collection.create_index([("interview_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
+        # Unique: a second save of the same answer is rejected by the index itself
+        question_feedback_collection.create_index([(field, ASCENDING) for field in QUESTION_FEEDBACK_KEY], unique=True)
+        _indexed = True
+
+
+def _session_filter(interview_id: str, user_id: str) -> dict:
+    return {"interview_id": interview_id, "user_id": user_id}
+
+
+# --- Query specs, shared with the async repository (app/repositories.py) ---
+
+COUNT_PROJECTION = {"_id": 0, "attempt_count": 1}
+# Per-question layout: the session only holds the counter
+NEXT_ATTEMPT_COUNTER = {"$inc": {"attempt_count": 1}}
+# Embedded layout: bump the counter and append the empty attempt server-side
+NEXT_EMBEDDED_ATTEMPT = [
+    {"$set": {"attempt_count": {"$add": [
+        {"$ifNull": ["$attempt_count", {"$size": {"$ifNull": ["$attempts", []]}}]}, 1
+    ]}}},
+    {"$set": {"attempts": {"$concatArrays": [
+        {"$ifNull": ["$attempts", []]},
+        [{"attempt_number": "$attempt_count", "questions_feedback": []}],
+    ]}}},
+]
+EMBEDDED_NUMBERS_PROJECTION = {"_id": 0, "attempt_count": 1, "attempts.attempt_number": 1}
+
+
+def embedded_latest(session: Optional[dict]) -> Optional[int]:
+    """Latest attempt number from an EMBEDDED_NUMBERS_PROJECTION read (counter, or legacy attempts)."""
+    if not session:
+        return None
+    if session.get("attempt_count") is not None:
+        return session["attempt_count"]
+    numbers = [attempt["attempt_number"] for attempt in session.get("attempts", [])]
+    return max(numbers) if numbers else None
+
+
+def attempt_filter(interview_id: str, user_id: str, attempt_number: int) -> dict:
+    """Matches the session while it has attempt attempt_number (numbers start at 1)."""
+    if FEEDBACK_SCHEMA == "per_question":
+        return {**_session_filter(interview_id, user_id), "attempt_count": {"$gte": attempt_number}}
+    return {**_session_filter(interview_id, user_id), "attempts.attempt_number": attempt_number}
+
+
+def question_list_query(interview_id: str, user_id: str, attempt_number: Optional[int], include_details: bool):
+    """(filter, projection, sort) of the per-question documents list_feedback reads."""
+    query = _session_filter(interview_id, user_id)
+    if attempt_number is not None:
+        query["attempt_number"] = attempt_number
+    projection = {"_id": 0, "user_id": 0, "interview_id": 0}
+    if not include_details:
+        projection["feedback"] = 0
+    # Sorted by the unique key, so this walks the index in order
+    return query, projection, [(field, ASCENDING) for field in QUESTION_FEEDBACK_KEY]
+
+
+def group_questions(questions, attempt_count: int, attempt_number: Optional[int]) -> List[dict]:
+    """Per-question documents (in key order) grouped into attempts; attempts without answers stay listed."""
+    numbers = [attempt_number] if attempt_number is not None else range(1, attempt_count + 1)
+    attempts = {number: {"attempt_number": number, "questions_feedback": []} for number in numbers if 1 <= number <= attempt_count}
+    for question in questions:
+        number = question.pop("attempt_number")
+        attempts.setdefault(number, {"attempt_number": number, "questions_feedback": []})["questions_feedback"].append(question)
+    return [attempts[number] for number in sorted(attempts)]
+
+
+def embedded_list_projection(attempt_number: Optional[int], include_details: bool) -> dict:
+    if attempt_number is not None:
+        return {"_id": 0, "attempts": {"$elemMatch": {"attempt_number": attempt_number}}}
+    if not include_details:
+        return {"_id": 0, "attempts.questions_feedback.feedback": 0}
+    return {"_id": 0, "attempts": 1}
+
+
+def embedded_attempts(session: dict, include_details: bool) -> List[dict]:
+    attempts = session.get("attempts", [])
+    if not include_details:
+        for attempt in attempts:
+            for question in attempt["questions_feedback"]:
+                question.pop("feedback", None)  # $elemMatch projections cannot also exclude subfields
+    return attempts
+
+
+def start_attempt(interview_id: str, user_id: str) -> int:
+    """
+    Opens the next attempt in one atomic upsert and returns its number. The counter (and, in
+    the embedded layout, the new empty attempt) is computed server-side, so concurrent starts
+    get distinct numbers and nothing already stored travels over the wire. Embedded sessions
+    written before attempt_count existed count their attempts instead.
+    """
+    if FEEDBACK_SCHEMA == "per_question":
+        _ensure_indexes()
+        collection, update = feedback_sessions_collection, NEXT_ATTEMPT_COUNTER
+    else:
+        collection, update = feedback_collection, NEXT_EMBEDDED_ATTEMPT
+    session = collection.find_one_and_update(
+        _session_filter(interview_id, user_id), update,
+        projection=COUNT_PROJECTION, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    return session["attempt_count"]
+
+
+def latest_attempt(interview_id: str, user_id: str) -> Optional[int]:
+    """Number of the session's latest attempt (None without a session), reading only the numbers."""
+    if FEEDBACK_SCHEMA == "per_question":
+        session = feedback_sessions_collection.find_one(_session_filter(interview_id, user_id), COUNT_PROJECTION)
+        return session["attempt_count"] if session else None
+    return embedded_latest(feedback_collection.find_one(_session_filter(interview_id, user_id), EMBEDDED_NUMBERS_PROJECTION))
+
+
+def has_attempt(interview_id: str, user_id: str, attempt_number: int) -> bool:
+    if attempt_number < 1:
+        return False
+    collection = feedback_sessions_collection if FEEDBACK_SCHEMA == "per_question" else feedback_collection
+    return collection.count_documents(attempt_filter(interview_id, user_id, attempt_number), limit=1) > 0
+
+
+def append_question_feedback(interview_id: str, user_id: str, attempt_number: int, question_feedback: dict) -> bool:
+    """
+    Stores one question's feedback for an attempt in a single write: a positional $push whose
+    filter only matches while the attempt has no feedback for the question yet (embedded), or an
+    insert that the unique key rejects (per_question). Either way a repeated or concurrent
+    submission cannot add a second entry, and other answers are never rewritten.
+    Returns False when nothing was added (duplicate, or no such attempt).
+    """
+    if FEEDBACK_SCHEMA == "per_question":
+        _ensure_indexes()
+        if not has_attempt(interview_id, user_id, attempt_number):
+            return False
+        try:
+            question_feedback_collection.insert_one(
+                {"user_id": user_id, "interview_id": interview_id, "attempt_number": attempt_number, **question_feedback}
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    result = feedback_collection.update_one(
+        {
+            **_session_filter(interview_id, user_id),
+            "attempts": {"$elemMatch": {
+                "attempt_number": attempt_number,
+                "questions_feedback.question_index": {"$ne": question_feedback["question_index"]},
+            }},
+        },
+        {"$push": {"attempts.$.questions_feedback": question_feedback}}
+    )
+    return result.modified_count == 1
+
+
+def list_feedback(interview_id: str, user_id: str, attempt_number: Optional[int] = None,
+                  include_details: bool = True) -> Optional[List[dict]]:
+    """
+    [{"attempt_number", "questions_feedback": [...]}] of a session in attempt order, or None
+    without a session. attempt_number limits it to one attempt; include_details=False
+    leaves out each answer's full "feedback" analysis (the review itself is overall_comments).
+    Only the requested parts are read from the database.
+    """
+    if FEEDBACK_SCHEMA == "per_question":
+        attempt_count = latest_attempt(interview_id, user_id)
+        if attempt_count is None:
+            return None
+        query, projection, sort = question_list_query(interview_id, user_id, attempt_number, include_details)
+        return group_questions(question_feedback_collection.find(query, projection).sort(sort), attempt_count, attempt_number)
+
+    session = feedback_collection.find_one(
+        _session_filter(interview_id, user_id), embedded_list_projection(attempt_number, include_details)
+    )
+    return None if session is None else embedded_attempts(session, include_details)
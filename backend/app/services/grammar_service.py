@@ -0,0 +1,209 @@
+import os
+import queue
+import threading
+import time
+from bisect import bisect_right
+from typing import List
+
+from app.utils.grammar_rules import check_quick
+from app.utils.latency import LatencyHistogram
+from app.utils.micro_batch import MicroBatcher
+
+# === Grammar settings ===
+# "auto": LanguageTool, quick rules under load or when LanguageTool is unavailable;
+# "languagetool": always LanguageTool; "quick": pure-Python rules only
+GRAMMAR_ENGINE = os.getenv("GRAMMAR_ENGINE", "auto")
+GRAMMAR_LANGUAGE = os.getenv("GRAMMAR_LANGUAGE", "en-US")
+# LanguageTool server processes (each is a JVM, roughly 0.5-1 GB)
+GRAMMAR_POOL_SIZE = int(os.getenv("GRAMMAR_POOL_SIZE", "2"))
+GRAMMAR_BATCH_SIZE = int(os.getenv("GRAMMAR_BATCH_SIZE", "8"))
+GRAMMAR_BATCH_WAIT_MS = float(os.getenv("GRAMMAR_BATCH_WAIT_MS", "20"))
+# "auto" answers from the quick rules once this many checks are already waiting
+GRAMMAR_MAX_BACKLOG = int(os.getenv("GRAMMAR_MAX_BACKLOG", "16"))
+GRAMMAR_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5)
+
+# Joins the transcripts of one batch; a paragraph break keeps LanguageTool's rules from
+# reading across answers
+_SEPARATOR = "\n\n"
+
+
+def _load_language_tool():
+    import language_tool_python
+    return language_tool_python.LanguageTool(GRAMMAR_LANGUAGE)
+
+
+class LanguageToolUnavailable(RuntimeError):
+    """LanguageTool could not be started (e.g. no Java runtime); not retried in this process."""
+
+
+def _match_field(match, name: str, legacy_name: str):
+    # language-tool-python 2.x named Match fields in camelCase (ruleId, errorLength)
+    value = getattr(match, name, None)
+    return getattr(match, legacy_name) if value is None else value
+
+
+class GrammarChecker:
+    """
+    Grammar checks backed by a pool of LanguageTool servers. Concurrent check() calls are
+    micro-batched: each batch is joined into one text and checked in a single round-trip by
+    whichever server is idle, and the matches are split back per transcript. Issues are plain
+    dicts (rule_id, message, offset, length, replacements), so they also cross the model-server
+    proxy. Under load (or without Java) the "auto" engine answers from the quick rules instead;
+    a check that fails for another reason falls back alone and its server is replaced.
+    """
+
+    def __init__(self, engine: str = GRAMMAR_ENGINE, pool_size: int = GRAMMAR_POOL_SIZE):
+        self.engine = engine
+        self._pool_size = pool_size
+        self._idle = queue.Queue()
+        self._created = 0
+        self._create_lock = threading.Lock()
+        self._unavailable = None
+        self.failed_checks = 0
+        self._batcher = MicroBatcher(
+            self._check_batch, GRAMMAR_BATCH_SIZE, GRAMMAR_BATCH_WAIT_MS, name="grammar-batcher", workers=pool_size
+        )
+        self._latency = {
+            "languagetool": LatencyHistogram(GRAMMAR_LATENCY_BUCKETS),
+            "quick": LatencyHistogram(GRAMMAR_LATENCY_BUCKETS),
+        }
+        self.shed = 0
+
+    def _acquire_tool(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._create_lock:
+            if self._created < self._pool_size:
+                self._created += 1
+                try:
+                    return _load_language_tool()
+                except Exception as e:
+                    self._created -= 1
+                    raise LanguageToolUnavailable(str(e)) from e
+        return self._idle.get()
+
+    def _discard_tool(self, tool):
+        """Drops a server whose check failed; the next batch starts a fresh one in its place."""
+        with self._create_lock:
+            self._created -= 1
+        try:
+            tool.close()
+        except Exception:
+            pass
+
+    def _check_batch(self, texts: List[str]) -> List[List[dict]]:
+        starts, position = [], 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + len(_SEPARATOR)
+
+        tool = self._acquire_tool()
+        try:
+            matches = tool.check(_SEPARATOR.join(texts))
+        except Exception:
+            self._discard_tool(tool)
+            raise
+        self._idle.put(tool)
+
+        results = [[] for _ in texts]
+        for match in matches:
+            index = bisect_right(starts, match.offset) - 1
+            offset = match.offset - starts[index]
+            length = _match_field(match, "error_length", "errorLength")
+            if offset + length > len(texts[index]):
+                continue  # touches the separator
+            results[index].append({
+                "rule_id": _match_field(match, "rule_id", "ruleId"),
+                "message": match.message,
+                "offset": offset,
+                "length": length,
+                "replacements": list(match.replacements[:5]),
+            })
+        return results
+
+    def _use_quick(self) -> bool:
+        if self.engine == "quick":
+            return True
+        if self.engine == "languagetool":
+            return False
+        if self._unavailable:
+            return True
+        if self._batcher.backlog() >= GRAMMAR_MAX_BACKLOG:
+            self.shed += 1
+            return True
+        return False
+
+    def _fall_back(self, error: Exception):
+        if isinstance(error, LanguageToolUnavailable):
+            print(f"LanguageTool unavailable, using quick grammar rules: {error}")
+            self._unavailable = str(error)
+        else:
+            # e.g. a JVM or HTTP hiccup: only this check falls back
+            print(f"LanguageTool check failed, using quick grammar rules for it: {error}")
+            self.failed_checks += 1
+
+    def _check_quick(self, text: str) -> List[dict]:
+        start = time.perf_counter()
+        try:
+            issues = check_quick(text)
+        except Exception:
+            self._latency["quick"].observe(time.perf_counter() - start, failed=True)
+            raise
+        self._latency["quick"].observe(time.perf_counter() - start)
+        return issues
+
+    def check(self, text: str) -> List[dict]:
+        """Grammar issues in text, ordered by offset."""
+        if not text or not text.strip():
+            return []
+        if self._use_quick():
+            return self._check_quick(text)
+        start = time.perf_counter()
+        try:
+            issues = self._batcher.submit(text)
+        except Exception as e:
+            self._latency["languagetool"].observe(time.perf_counter() - start, failed=True)
+            if self.engine != "auto":
+                raise
+            self._fall_back(e)
+            return self._check_quick(text)
+        self._latency["languagetool"].observe(time.perf_counter() - start)
+        return issues
+
+    def check_batch(self, texts: List[str]) -> List[List[dict]]:
+        """check() for several transcripts at once; they share LanguageTool round-trips."""
+        if self._use_quick():
+            return [self.check(text) for text in texts]
+        start = time.perf_counter()
+        futures = {index: self._batcher.submit_future(text) for index, text in enumerate(texts) if text and text.strip()}
+        results, failed = [], False
+        for index, text in enumerate(texts):
+            if index not in futures:
+                results.append([])
+                continue
+            try:
+                results.append(futures[index].result())
+            except Exception as e:
+                if self.engine != "auto":
+                    self._latency["languagetool"].observe(time.perf_counter() - start, failed=True)
+                    raise
+                failed = True
+                self._fall_back(e)
+                results.append(self._check_quick(text))
+        self._latency["languagetool"].observe(time.perf_counter() - start, failed=failed)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "engine": self.engine,
+            "pool_size": self._pool_size,
+            "servers_started": self._created,
+            "languagetool_unavailable": self._unavailable,
+            "failed_checks": self.failed_checks,
+            "backlog": self._batcher.backlog(),
+            "shed_to_quick_rules": self.shed,
+            "batching": self._batcher.stats(),
+            "latency": {engine: histogram.snapshot() for engine, histogram in self._latency.items()},
+        }
@@ -0,0 +1,61 @@
+import os
+from typing import Iterable, Optional
+
+from app.database import db
+from app.utils.ttl_cache import TTLCache
+
+# === Interview cache settings ===
+# Interviews held per process (0 disables the cache)
+INTERVIEW_CACHE_ENTRIES = int(os.getenv("INTERVIEW_CACHE_ENTRIES", "1024"))
+INTERVIEW_CACHE_TTL_SECONDS = float(os.getenv("INTERVIEW_CACHE_TTL_SECONDS", "600"))
+
+# What the read endpoints return; sample_answer_embeddings stay in the database.
+# parsed_resume only exists on interviews stored before the resume index.
+CACHED_FIELDS = (
+    "interview_id", "user_id", "position", "job_description", "interview_type", "difficulty_level",
+    "resume_hash", "parsed_resume", "questions", "sample_answers", "sample_answers_status", "created_at",
+)
+CACHED_PROJECTION = {"_id": 0, **{field: 1 for field in CACHED_FIELDS}}
+
+interview_cache = TTLCache(INTERVIEW_CACHE_ENTRIES, INTERVIEW_CACHE_TTL_SECONDS)
+
+
+def is_final(interview: dict) -> bool:
+    """
+    Whether the document can no longer change. Sample answers of a pipelined upload are still
+    being written (possibly by another worker process) while the status is pending, so those
+    documents are never cached; everything else about an interview is written once.
+    """
+    return interview.get("sample_answers_status") != "pending"
+
+
+def select(interview: Optional[dict], fields: Iterable[str]) -> Optional[dict]:
+    """A new dict with just the requested fields (the cached document itself is shared)."""
+    if interview is None:
+        return None
+    return {field: interview[field] for field in fields if field in interview}
+
+
+def remember(interview_id: str, interview: Optional[dict]):
+    if interview is not None and is_final(interview):
+        interview_cache.set(interview_id, interview)
+
+
+def invalidate(interview_id: str):
+    """Call after every write to an interview document."""
+    interview_cache.invalidate(interview_id)
+
+
+def get_interview(interview_id: str, fields: Iterable[str]) -> Optional[dict]:
+    """
+    The requested CACHED_FIELDS of an interview for blocking callers (worker threads), served
+    from the cache when possible; a miss loads every cached field once so the next endpoint
+    hits too. With the cache disabled only the requested fields are read.
+    """
+    if not interview_cache.enabled:
+        return db.interviews.find_one({"interview_id": interview_id}, {"_id": 0, **{field: 1 for field in fields}})
+    interview = interview_cache.get(interview_id)
+    if interview is None:
+        interview = db.interviews.find_one({"interview_id": interview_id}, CACHED_PROJECTION)
+        remember(interview_id, interview)
+    return select(interview, fields)
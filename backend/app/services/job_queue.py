@@ -0,0 +1,144 @@
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Jobs live in this process's memory, so /feedback/jobs/{id} and /interview/answer_jobs/{id}
+# only resolve on the process that queued the job: run the API as a single uvicorn worker
+# (see the Procfile) and scale with the worker threads below.
+
+# === Job queue settings ===
+FEEDBACK_WORKERS = int(os.getenv("FEEDBACK_WORKERS", "2"))
+FEEDBACK_QUEUE_SIZE = int(os.getenv("FEEDBACK_QUEUE_SIZE", "50"))
+JOB_TTL_SECONDS = int(os.getenv("FEEDBACK_JOB_TTL_SECONDS", "3600"))
+SAMPLE_ANSWER_WORKERS = int(os.getenv("SAMPLE_ANSWER_WORKERS", "2"))
+SAMPLE_ANSWER_QUEUE_SIZE = int(os.getenv("SAMPLE_ANSWER_QUEUE_SIZE", "50"))
+
+FINISHED_STATES = ("completed", "failed")
+
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already waiting for a worker."""
+
+
+class Job:
+    """In-process record of a queued job, its stage events and its result."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.id = str(uuid.uuid4())
+        self.status = "queued"
+        self.stages = {}
+        self.events = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self._task = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stages": self.stages,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    def _record(self, event: str, data: dict):
+        """Appends an event and wakes up stream listeners (event loop thread only)."""
+        self.events.append({"event": event, "data": data})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _start(self):
+        self.status = "running"
+        self._record("running", {"job_id": self.id})
+
+    def report_stage(self, stage: str, result=None):
+        """Stage callback handed to the worker; safe to call from any thread."""
+        def _apply():
+            self.stages[stage] = result
+            self._record("stage", {"stage": stage, "result": result})
+        self._loop.call_soon_threadsafe(_apply)
+
+    async def stream(self, keepalive_seconds: float = 15.0):
+        """Yields recorded events as they arrive until the job has finished."""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class JobQueue:
+    """Runs blocking jobs on a bounded thread pool without blocking the event loop."""
+
+    def __init__(self, max_workers: int = FEEDBACK_WORKERS, max_pending: int = FEEDBACK_QUEUE_SIZE, name: str = "feedback"):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-job")
+        self._max_pending = max_pending
+        self.name = name
+        self._jobs = {}
+
+    def pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Job:
+        """
+        Queues fn(*args, report_stage=..., **kwargs) and returns its Job immediately.
+        Must be called from within the running event loop.
+        """
+        self._prune()
+        if self.pending_count() >= self._max_pending:
+            raise QueueFullError(f"{self.name.capitalize()} queue is full, please retry shortly.")
+
+        job = Job(asyncio.get_running_loop())
+        self._jobs[job.id] = job
+        job._task = asyncio.create_task(self._run(job, fn, args, kwargs))
+        return job
+
+    async def _run(self, job: Job, fn: Callable, args: tuple, kwargs: dict):
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, self._call, job, fn, args, kwargs)
+            job.result = result
+            job.status = "completed"
+        except Exception as e:
+            print(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        job._record(job.status, job.to_dict())
+
+    @staticmethod
+    def _call(job: Job, fn: Callable, args: tuple, kwargs: dict):
+        job._loop.call_soon_threadsafe(job._start)
+        return fn(*args, report_stage=job.report_stage, **kwargs)
+
+    def _prune(self):
+        """Drops finished jobs older than the retention window."""
+        cutoff = time.time() - JOB_TTL_SECONDS
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+feedback_jobs = JobQueue()
+sample_answer_jobs = JobQueue(SAMPLE_ANSWER_WORKERS, SAMPLE_ANSWER_QUEUE_SIZE, name="sample-answer")
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# === LLM cache settings ===
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "mongo")  # mongo | disk | memory | off
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+# Trim the persistent store back to LLM_CACHE_MAX_ENTRIES every this many writes
+_EVICT_EVERY = 100
+# A persistent hit rewrites last_access only when it is older than this
+_ACCESS_REFRESH_SECONDS = LLM_CACHE_TTL_SECONDS / 2
+
+
+def cache_key(model_name: str, prompt, json_mode: bool = False) -> str:
+    """SHA-256 of the model name, prompt (a string or a list of prompt parts) and response mode."""
+    # Plain-mode keys keep their original form, so entries already stored stay valid
+    parts = [model_name, prompt, "json"] if json_mode else [model_name, prompt]
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """Bounded in-process LRU with TTL; also the front tier of the persistent backends."""
+
+    def __init__(self, max_entries: int):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            text, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def set(self, key: str, model_name: str, text: str, expires_at: float):
+        with self._lock:
+            self._entries[key] = (text, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteBackend:
+    """On-disk store; LRU eviction by last access time, expiry by TTL."""
+
+    def __init__(self, path: str, max_entries: int):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, model TEXT, text TEXT, expires_at REAL, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+        return row[0] if row else None
+
+    def set(self, key: str, model_name: str, text: str, expires_at: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, text, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, text, expires_at, now)
+            )
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self._max_entries,)
+                )
+            self._conn.commit()
+
+
+class MongoBackend:
+    """Shared store in the llm_cache collection; a TTL index expires entries, LRU trims the rest."""
+
+    def __init__(self, max_entries: int):
+        from app.database import db
+        self._collection = db["llm_cache"]
+        self._max_entries = max_entries
+        self._writes = 0
+        self._indexed = False
+
+    def _ensure_indexes(self):
+        if not self._indexed:
+            self._collection.create_index("expires_at", expireAfterSeconds=0)
+            self._collection.create_index("last_access")
+            self._indexed = True
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        doc = self._collection.find_one(
+            {"_id": key, "expires_at": {"$gt": _as_datetime(now)}}, {"text": 1, "last_access": 1}
+        )
+        if doc is None:
+            return None
+        # Reads stay reads; last_access (for LRU trimming) only needs to be roughly current
+        if now - doc.get("last_access", 0) > _ACCESS_REFRESH_SECONDS:
+            self._collection.update_one({"_id": key}, {"$set": {"last_access": now}})
+        return doc["text"]
+
+    def set(self, key: str, model_name: str, text: str, expires_at: float):
+        self._ensure_indexes()
+        now = time.time()
+        self._collection.replace_one(
+            {"_id": key},
+            {"model": model_name, "text": text, "expires_at": _as_datetime(expires_at), "last_access": now},
+            upsert=True
+        )
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            excess = self._collection.estimated_document_count() - self._max_entries
+            if excess > 0:
+                oldest = self._collection.find({}, {"_id": 1}).sort("last_access", 1).limit(excess)
+                self._collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+
+
+def _as_datetime(timestamp: float):
+    from datetime import datetime, timezone
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class LLMCache:
+    """Two-tier (memory LRU, then persistent) cache of LLM responses with hit/miss metrics."""
+
+    def __init__(self, backend_name: str = LLM_CACHE_BACKEND):
+        self.backend_name = backend_name
+        self._memory = MemoryBackend(LLM_CACHE_MEMORY_ENTRIES)
+        self._persistent = None
+        self._persistent_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend_name != "off"
+
+    def _backend(self):
+        if self.backend_name in ("memory", "off"):
+            return None
+        with self._persistent_lock:
+            if self._persistent is None:
+                if self.backend_name == "disk":
+                    self._persistent = SqliteBackend(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES)
+                else:
+                    self._persistent = MongoBackend(LLM_CACHE_MAX_ENTRIES)
+        return self._persistent
+
+    def get(self, key: str) -> Optional[str]:
+        text = self._memory.get(key)
+        if text is None and self._backend() is not None:
+            try:
+                text = self._backend().get(key)
+            except Exception as e:
+                self.errors += 1
+                print(f"LLM cache read failed: {e}")
+            if text is not None:
+                self._memory.set(key, "", text, time.time() + LLM_CACHE_TTL_SECONDS)
+        if text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return text
+
+    def set(self, key: str, model_name: str, text: str):
+        expires_at = time.time() + LLM_CACHE_TTL_SECONDS
+        self._memory.set(key, model_name, text, expires_at)
+        if self._backend() is not None:
+            try:
+                self._backend().set(key, model_name, text, expires_at)
+            except Exception as e:
+                self.errors += 1
+                print(f"LLM cache write failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+llm_cache = LLMCache()
+
@@ -0,0 +1,219 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from app.services.llm_cache import cache_key, llm_cache
+from app.utils.latency import LatencyHistogram
+from app.utils.rate_limit import TokenBucket
+
+load_dotenv()
+
+# === LLM gateway settings ===
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+# Requests per minute allowed for the whole deployment (the free Gemini tier allows 15)
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "15"))
+# "memory": one bucket per process, which is the whole deployment when the API runs as the single
+# uvicorn worker the Procfile starts; "mongo": one quota shared by every process (set it when
+# running several workers or hosts)
+LLM_RATE_LIMIT_BACKEND = os.getenv("LLM_RATE_LIMIT_BACKEND", "memory")
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+
+class MongoRateLimiter:
+    """
+    Fixed one-minute windows counted in the llm_rate_limit collection, so the per-minute quota
+    holds across all worker processes. Same try_acquire/acquire interface as TokenBucket.
+    """
+
+    def __init__(self, name: str, rate_per_minute: int):
+        from app.database import db
+        self._collection = db["llm_rate_limit"]
+        self._name = name
+        self._limit = rate_per_minute
+        self._indexed = False
+
+    def try_acquire(self) -> float:
+        from pymongo import ReturnDocument
+        if not self._indexed:
+            self._collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        now = time.time()
+        window = int(now // 60)
+        doc = self._collection.find_one_and_update(
+            {"_id": f"{self._name}:{window}"},
+            {"$inc": {"count": 1}, "$setOnInsert": {"expires_at": _as_datetime((window + 2) * 60)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc["count"] <= self._limit:
+            return 0.0
+        return (window + 1) * 60 - now
+
+    def acquire(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def _as_datetime(timestamp: float):
+    from datetime import datetime, timezone
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Quota, overload and timeout errors are worth retrying; bad requests are not."""
+    try:
+        from google.api_core import exceptions as api_exceptions
+    except ImportError:
+        return False
+    return isinstance(exc, (
+        api_exceptions.TooManyRequests,
+        api_exceptions.ResourceExhausted,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.InternalServerError,
+        api_exceptions.DeadlineExceeded,
+    ))
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff, so retrying workers do not hit the API in lockstep."""
+    return random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class LLMGateway:
+    """
+    The one way the app talks to Gemini. Configures the client once from GEMINI_API_KEY and
+    reuses model instances (and their connections), serves repeats from the LLM cache, shares a
+    per-minute quota across call sites, retries transient failures with jittered backoff and
+    lets identical in-flight prompts share a single API call. generate() blocks, so routes call
+    it (through the nlp and feedback services) from the threadpool or a background job.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._models = {}
+        self._models_lock = threading.Lock()
+        self._limiter = None
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self.retries = 0
+        self.coalesced = 0
+        self.rate_limited_seconds = 0.0
+
+    def model(self, json_mode: bool = False, model_name: str = GEMINI_MODEL):
+        """Shared GenerativeModel; json_mode asks for an application/json response."""
+        with self._models_lock:
+            if not self._configured:
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))  # Use .env for security
+                self._configured = True
+            key = (model_name, json_mode)
+            if key not in self._models:
+                import google.generativeai as genai
+                config = {"response_mime_type": "application/json"} if json_mode else None
+                self._models[key] = genai.GenerativeModel(model_name, generation_config=config)
+            return self._models[key]
+
+    def limiter(self):
+        if self._limiter is None:
+            with self._models_lock:
+                if self._limiter is None:
+                    if LLM_RATE_LIMIT_BACKEND == "mongo":
+                        self._limiter = MongoRateLimiter("gemini", GEMINI_REQUESTS_PER_MINUTE)
+                    else:
+                        self._limiter = TokenBucket(GEMINI_REQUESTS_PER_MINUTE)
+        return self._limiter
+
+    def _histogram(self, site: str) -> LatencyHistogram:
+        if site not in self._histograms:
+            with self._inflight_lock:
+                self._histograms.setdefault(site, LatencyHistogram(LATENCY_BUCKETS))
+        return self._histograms[site]
+
+    def generate(self, prompt, site: str, json_mode: bool = False, use_cache: bool = True) -> str:
+        """
+        Response text for prompt (a string or list of prompt parts). site names the caller in
+        the latency metrics. use_cache=False forces a fresh call; the result still refreshes the
+        cache. Empty responses are never cached. Raises the last error once retries run out.
+        """
+        model = self.model(json_mode)
+        key = cache_key(model.model_name, prompt, json_mode)
+        if use_cache and llm_cache.enabled:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return pending.result()
+
+        start = time.perf_counter()
+        try:
+            text = self._call_with_retries(model, prompt)
+        except Exception as e:
+            self._histogram(site).observe(time.perf_counter() - start, failed=True)
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        self._histogram(site).observe(time.perf_counter() - start)
+        if text and llm_cache.enabled:
+            llm_cache.set(key, model.model_name, text)
+        pending.set_result(text)
+        return text
+
+    def _call_with_retries(self, model, prompt) -> str:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            self._wait_for_quota()
+            try:
+                response = model.generate_content(prompt)
+                return response.text if response else ""
+            except Exception as e:
+                if attempt == LLM_MAX_RETRIES or not _is_retryable(e):
+                    raise
+                self.retries += 1
+                delay = _backoff(attempt)
+                print(f"Gemini call failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _wait_for_quota(self):
+        start = time.perf_counter()
+        self.limiter().acquire()
+        self.rate_limited_seconds += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        return {
+            "model": GEMINI_MODEL,
+            "requests_per_minute": GEMINI_REQUESTS_PER_MINUTE,
+            "rate_limit_backend": LLM_RATE_LIMIT_BACKEND,
+            "rate_limited_seconds": round(self.rate_limited_seconds, 2),
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "cache": llm_cache.stats(),
+            "call_sites": {site: histogram.snapshot() for site, histogram in sorted(self._histograms.items())},
+        }
+
+
+llm_gateway = LLMGateway()
@@ -0,0 +1,167 @@
+import os
+import resource
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Callable, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# === Model serving settings ===
+# "host:port" of a shared model server (python -m app.services.model_server); empty = load in-process
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS", "")
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY", "nextgen-models").encode()
+# Models the server hosts; their methods must take and return picklable values
+SERVED_MODELS = [name for name in os.getenv("MODEL_SERVER_MODELS", "emotion_classifier,grammar_tool").split(",") if name]
+# Comma-separated models to load at startup, or "all"
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", "")
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (falls back to peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class ModelManager(BaseManager):
+    """Connects workers to the shared model server."""
+
+
+class ModelRegistry:
+    """
+    Loads models lazily on first use (or eagerly via warm_up) and keeps one instance per process.
+    When MODEL_SERVER_ADDRESS is set, served models resolve to proxies of the instances held by
+    the model server, so every worker shares one copy instead of loading its own.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable] = {}
+        self._models = {}
+        self._stats = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._manager: Optional[ModelManager] = None
+        self._manager_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable):
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def names(self):
+        return list(self._loaders)
+
+    def get(self, name: str):
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model '{name}'")
+        if MODEL_SERVER_ADDRESS and name in SERVED_MODELS:
+            return self._remote(name)
+        return self.load_local(name)
+
+    def load_local(self, name: str):
+        """Returns this process's own instance of the model, loading it if needed."""
+        if name in self._models:
+            return self._models[name]
+
+        with self._locks[name]:
+            if name not in self._models:
+                rss_before, start = _rss_mb(), time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self._stats[name] = {
+                    "load_seconds": round(time.perf_counter() - start, 2),
+                    "rss_delta_mb": round(_rss_mb() - rss_before, 1),
+                }
+                print(f"Loaded model '{name}': {self._stats[name]}")
+        return self._models[name]
+
+    def get_loaded(self, name: str):
+        """The model if it is already available, or None; unlike get() it never loads one."""
+        if MODEL_SERVER_ADDRESS and name in SERVED_MODELS:
+            return self._remote(name)  # the model server loads its models at start
+        return self._models.get(name)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None):
+        """Eagerly loads the given models (all registered models by default)."""
+        for name in names or self.names():
+            self.get(name)
+
+    def stats(self) -> dict:
+        return {
+            "server": MODEL_SERVER_ADDRESS or None,
+            "process_rss_mb": round(_rss_mb(), 1),
+            "models": {
+                name: {
+                    "loaded": name in self._models,
+                    "served_remotely": bool(MODEL_SERVER_ADDRESS) and name in SERVED_MODELS,
+                    **self._stats.get(name, {}),
+                }
+                for name in self._loaders
+            },
+        }
+
+    def _remote(self, name: str):
+        with self._manager_lock:
+            if self._manager is None:
+                host, port = MODEL_SERVER_ADDRESS.rsplit(":", 1)
+                for served in SERVED_MODELS:
+                    ModelManager.register(served)
+                manager = ModelManager(address=(host, int(port)), authkey=MODEL_SERVER_AUTHKEY)
+                manager.connect()
+                self._manager = manager
+        return getattr(self._manager, name)()
+
+
+# === Model loaders (heavy imports stay inside so importing this module is cheap) ===
+
+def _load_gemini():
+    from app.services.llm_gateway import llm_gateway
+    return llm_gateway.model()  # configured once, shared with every gateway call
+
+
+def _load_grammar_tool():
+    from app.services.grammar_service import GrammarChecker
+    return GrammarChecker()  # LanguageTool servers start on first check
+
+
+def _load_whisper():
+    from faster_whisper import WhisperModel
+    return WhisperModel(
+        os.getenv("WHISPER_MODEL_SIZE", "base"),  # Use "medium" or "large" if needed
+        device=os.getenv("WHISPER_DEVICE", "cpu"),
+        compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+        cpu_threads=int(os.getenv("WHISPER_CPU_THREADS", "0")),
+        # Transcriptions decoded in parallel (concurrent callers beyond this wait for a worker)
+        num_workers=int(os.getenv("WHISPER_NUM_WORKERS", "4"))
+    )
+
+
+def _load_emotion_classifier():
+    from app.services.emotion_service import EmotionRecognizer
+    recognizer = EmotionRecognizer()
+    recognizer._model()  # load wav2vec2 now, so WARMUP_MODELS covers it rather than the first analysis
+    return recognizer
+
+
+def _load_sentence_encoder():
+    from sentence_transformers import SentenceTransformer
+    # Small CPU model (~90 MB, 384-d); sample-answer embeddings are stored, so changing it needs a re-encode
+    return SentenceTransformer(os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"), device="cpu")
+
+
+registry = ModelRegistry()
+registry.register("gemini", _load_gemini)
+registry.register("grammar_tool", _load_grammar_tool)
+registry.register("whisper", _load_whisper)
+registry.register("emotion_classifier", _load_emotion_classifier)
+registry.register("sentence_encoder", _load_sentence_encoder)
+
+
+def warm_up_from_env():
+    """Startup hook: loads the models listed in WARMUP_MODELS."""
+    if not WARMUP_MODELS:
+        return
+    names = None if WARMUP_MODELS == "all" else [name.strip() for name in WARMUP_MODELS.split(",") if name.strip()]
+    registry.warm_up(names)
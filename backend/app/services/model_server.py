@@ -0,0 +1,32 @@
+"""
+Shared model-serving process. Start one per host:
+
+    MODEL_SERVER_ADDRESS=127.0.0.1:50055 python -m app.services.model_server
+
+and give the API workers the same MODEL_SERVER_ADDRESS (and MODEL_SERVER_AUTHKEY). The models in
+MODEL_SERVER_MODELS are loaded once here; workers call them through proxies instead of each
+keeping a copy.
+"""
+from functools import partial
+
+from app.services.model_registry import (
+    MODEL_SERVER_ADDRESS, MODEL_SERVER_AUTHKEY, SERVED_MODELS, ModelManager, registry
+)
+
+
+def serve():
+    if not MODEL_SERVER_ADDRESS:
+        raise SystemExit("Set MODEL_SERVER_ADDRESS (host:port) to start the model server.")
+
+    for name in SERVED_MODELS:
+        registry.load_local(name)
+        ModelManager.register(name, callable=partial(registry.load_local, name))
+
+    host, port = MODEL_SERVER_ADDRESS.rsplit(":", 1)
+    manager = ModelManager(address=(host, int(port)), authkey=MODEL_SERVER_AUTHKEY)
+    print(f"Serving models {SERVED_MODELS} on {MODEL_SERVER_ADDRESS}: {registry.stats()['models']}")
+    manager.get_server().serve_forever()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,113 @@
+import datetime
+import hashlib
+import json
+import os
+from typing import Callable, List, Optional, Tuple
+
+from app.database import db
+
+# === Resume index settings ===
+# Reuse a stored question set for the same resume, position, JD, type and difficulty
+REUSE_QUESTION_SETS = os.getenv("REUSE_QUESTION_SETS", "1") == "1"
+QUESTION_SET_TTL_DAYS = int(os.getenv("QUESTION_SET_TTL_DAYS", "30"))
+
+resumes_collection = db["resumes"]
+question_sets_collection = db["question_sets"]
+_indexed = False
+
+
+def _ensure_indexes():
+    global _indexed
+    if not _indexed:
+        question_sets_collection.create_index("expires_at", expireAfterSeconds=0)
+        _indexed = True
+
+
+def _now():
+    return datetime.datetime.utcnow()
+
+
+def fingerprint(data: bytes) -> str:
+    """SHA-256 of the uploaded file bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_or_parse_resume(file_bytes: bytes, filename: str, parse: Callable[[bytes, str], dict]) -> Tuple[str, dict]:
+    """
+    (resume hash, parsed resume). A resume whose bytes were seen before is read back from the
+    resumes collection; otherwise parse(file_bytes, filename) runs and a successful result is stored.
+    """
+    resume_hash = fingerprint(file_bytes)
+    stored = resumes_collection.find_one_and_update(
+        {"_id": resume_hash},
+        {"$set": {"last_used_at": _now()}, "$inc": {"use_count": 1}},
+        projection={"parsed_resume": 1}
+    )
+    if stored:
+        return resume_hash, stored["parsed_resume"]
+
+    parsed_resume = parse(file_bytes, filename)
+    if "error" not in parsed_resume:
+        resumes_collection.update_one(
+            {"_id": resume_hash},
+            {
+                "$setOnInsert": {"parsed_resume": parsed_resume, "filename": filename, "size": len(file_bytes), "created_at": _now()},
+                "$set": {"last_used_at": _now()},
+                "$inc": {"use_count": 1},
+            },
+            upsert=True
+        )
+    return resume_hash, parsed_resume
+
+
+def get_parsed_resume(resume_hash: str) -> Optional[dict]:
+    stored = resumes_collection.find_one({"_id": resume_hash}, {"parsed_resume": 1})
+    return stored["parsed_resume"] if stored else None
+
+
+def question_set_key(resume_hash: str, position: str, job_description: str, interview_type: str, difficulty_level: str) -> str:
+    """Secondary key: the same resume asked the same way gets the same question set."""
+    jd_hash = fingerprint(job_description.strip().encode("utf-8"))
+    parts = [resume_hash, position.strip().lower(), jd_hash, interview_type.strip().lower(), difficulty_level.strip().lower()]
+    return fingerprint(json.dumps(parts).encode("utf-8"))
+
+
+def find_question_set(key: str) -> Optional[dict]:
+    """
+    {"questions", "sample_answers" (None until complete), "sample_answer_embeddings"} of a stored
+    set, if reuse is enabled.
+    """
+    if not REUSE_QUESTION_SETS:
+        return None
+    return question_sets_collection.find_one(
+        {"_id": key}, {"_id": 0, "questions": 1, "sample_answers": 1, "sample_answer_embeddings": 1}
+    )
+
+
+def store_questions(key: str, questions: List[str]):
+    """Starts (or, on regenerate, replaces) a question set; its answers are added once complete."""
+    if not REUSE_QUESTION_SETS or not questions:
+        return
+    _ensure_indexes()
+    question_sets_collection.replace_one(
+        {"_id": key},
+        {
+            "questions": questions,
+            "sample_answers": None,
+            "sample_answer_embeddings": None,
+            "created_at": _now(),
+            "expires_at": _now() + datetime.timedelta(days=QUESTION_SET_TTL_DAYS),
+        },
+        upsert=True
+    )
+
+
+def store_answers(key: str, questions: List[str], answers: List[str], embeddings: Optional[List[bytes]] = None):
+    """Completes a question set, unless any answer failed or the questions were replaced meanwhile."""
+    failed = ("Error:", "No answer generated.")
+    if not REUSE_QUESTION_SETS or any(not answer or answer.startswith(failed) for answer in answers):
+        return
+    question_sets_collection.update_one(
+        {"_id": key, "questions": questions},
+        {"$set": {"sample_answers": answers, "sample_answer_embeddings": embeddings}}
+    )
@@ -0,0 +1,43 @@
+import os
+import time
+import uuid
+from typing import Optional
+
+from app.utils.online_speech import OnlineSpeechAnalyzer
+
+# How long a finished stream's analysis waits to be claimed by /feedback/analyze-feedback/
+STREAM_RESULT_TTL_SECONDS = int(os.getenv("STREAM_RESULT_TTL_SECONDS", "1800"))
+MAX_STREAM_SECONDS = int(os.getenv("MAX_STREAM_SECONDS", "900"))
+
+_finished = {}
+
+
+def start_stream(sample_rate: int):
+    """Returns a new stream id and the analyzer that will accumulate its audio."""
+    return str(uuid.uuid4()), OnlineSpeechAnalyzer(sample_rate)
+
+
+def finish_stream(stream_id: str, analyzer: OnlineSpeechAnalyzer) -> dict:
+    """Stores the final speech analysis so the feedback request can reuse it."""
+    _prune()
+    summary = analyzer.summary()
+    _finished[stream_id] = (time.time(), summary)
+    return summary
+
+
+def claim_stream_result(stream_id: str) -> Optional[dict]:
+    """Returns (and forgets) the speech analysis of a finished stream, if still held."""
+    _prune()
+    entry = _finished.pop(stream_id, None)
+    return entry[1] if entry else None
+
+
+def release_stream_result(stream_id: str, summary: dict):
+    """Puts back a claimed analysis whose feedback request failed, so the retry can claim it."""
+    _finished[stream_id] = (time.time(), summary)
+
+
+def _prune():
+    cutoff = time.time() - STREAM_RESULT_TTL_SECONDS
+    for stream_id in [key for key, (finished_at, _) in _finished.items() if finished_at < cutoff]:
+        del _finished[stream_id]
@@ -0,0 +1,34 @@
+import os
+
+from app.services.model_registry import registry
+
+# === Transcription settings ===
+# Concurrency comes from the model itself: it is built with num_workers=WHISPER_NUM_WORKERS
+# (see model_registry), so that many requests decode in parallel on CTranslate2's workers
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "1"))
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "en")
+# Silero VAD in faster-whisper drops silent chunks before decoding
+WHISPER_VAD_FILTER = os.getenv("WHISPER_VAD_FILTER", "1") == "1"
+
+
+def transcribe_file(audio_path: str) -> dict:
+    """Transcribes a file on the shared local faster-whisper model; call it from a worker thread."""
+    segments, info = registry.get("whisper").transcribe(
+        audio_path,
+        language=WHISPER_LANGUAGE,
+        beam_size=WHISPER_BEAM_SIZE,
+        vad_filter=WHISPER_VAD_FILTER,
+        word_timestamps=True,
+    )
+    words = [
+        {"word": word.word.strip(), "start": round(word.start, 2), "end": round(word.end, 2), "probability": round(word.probability, 3)}
+        for segment in segments
+        for word in (segment.words or [])
+    ]
+    return {
+        "text": " ".join(word["word"] for word in words),
+        "words": words,
+        "duration": round(info.duration, 2),
+        "speech_duration": round(info.duration_after_vad, 2),
+    }
+
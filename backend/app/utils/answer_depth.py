@@ -0,0 +1,42 @@
+import math
+import re
+
+from app.utils.skill_matcher import technical_term_matcher
+
+# Vocabulary of engineering reasoning: trade-offs, performance, correctness, scale
+DEPTH_TERMS = re.compile(
+    r"\b(?:trade-?offs?|latency|throughput|complexity|big[- ]o|o\(n|scalab\w*|concurren\w*|parallel\w*|"
+    r"asynchron\w*|cach\w+|index\w*|shard\w*|replica\w*|consisten\w*|idempoten\w*|transaction\w*|"
+    r"bottleneck\w*|profil\w+|benchmark\w*|optimi[sz]\w*|memory|cpu|thread\w*|queue\w*|load balanc\w*|"
+    r"architecture|design pattern\w*|abstraction\w*|interface\w*|encapsulat\w*|polymorphism|inheritance|"
+    r"recursion|algorithm\w*|data structure\w*|hash\w*|tree\w*|graph\w*|schema\w*|normali[sz]\w*|"
+    r"test\w*|deploy\w*|monitor\w*|fault[- ]toleran\w*|security|authenticat\w*|encrypt\w*)\b",
+    re.IGNORECASE,
+)
+EXAMPLE_MARKERS = re.compile(r"\b(?:for example|for instance|such as|e\.g\.|in my (?:project|internship|role|team)|we built|i built|i implemented)\b", re.IGNORECASE)
+REASONING_MARKERS = re.compile(r"\b(?:because|therefore|so that|which means|as a result|instead of|compared to|whereas|however)\b", re.IGNORECASE)
+METRICS = re.compile(r"\b\d+(?:\.\d+)?\s*(?:%|percent|ms|milliseconds|seconds|x|times|users|requests|gb|mb|k\b)", re.IGNORECASE)
+
+# Weights of the depth signals (sum to 1) and the counts at which each saturates
+_WEIGHTS = {"terms": 0.35, "skills": 0.2, "reasoning": 0.15, "examples": 0.1, "metrics": 0.1, "length": 0.1}
+_SATURATION = {"terms": 8, "skills": 4, "reasoning": 3, "examples": 2, "metrics": 2}
+
+
+def technical_depth(transcript: str) -> float:
+    """
+    0-1 technical depth from what the answer contains: engineering vocabulary, named
+    technologies, causal reasoning, concrete examples and numbers, with a small credit for
+    length (log-scaled, saturating around 200 words).
+    """
+    if not transcript or not transcript.strip():
+        return 0.0
+    counts = {
+        "terms": len(DEPTH_TERMS.findall(transcript)),
+        "skills": len(technical_term_matcher.unique(transcript)),
+        "reasoning": len(REASONING_MARKERS.findall(transcript)),
+        "examples": len(EXAMPLE_MARKERS.findall(transcript)),
+        "metrics": len(METRICS.findall(transcript)),
+    }
+    signals = {name: min(1.0, count / _SATURATION[name]) for name, count in counts.items()}
+    signals["length"] = min(1.0, math.log1p(len(transcript.split())) / math.log1p(200))
+    return round(sum(_WEIGHTS[name] * value for name, value in signals.items()), 2)
@@ -0,0 +1,36 @@
+from typing import BinaryIO, Union
+import numpy as np
+import librosa
+
+TARGET_SAMPLE_RATE = 16000
+
+
+class AudioBuffer:
+    """
+    A recording decoded once to mono float32 at 16 kHz. The NumPy samples are the single
+    backing store; the torch views handed to the emotion model share the same memory.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def as_tensor(self):
+        """Zero-copy 1-D torch view of the samples."""
+        import torch  # DSP worker processes never need torch
+        return torch.from_numpy(self.samples)
+
+    def as_batch(self):
+        """Zero-copy (1, n) batch plus relative lengths, as SpeechBrain's classify_batch expects."""
+        import torch
+        return self.as_tensor().unsqueeze(0), torch.ones(1)
+
+
+def load_audio(audio_file: Union[str, BinaryIO], sample_rate: int = TARGET_SAMPLE_RATE) -> AudioBuffer:
+    """Decodes and resamples an audio file (path, or file-like such as a spooled upload's mmap) exactly once."""
+    samples, sr = librosa.load(audio_file, sr=sample_rate, mono=True, dtype=np.float32)
+    return AudioBuffer(samples, sr)
@@ -1,44 +1,26 @@
-import speech_recognition as sr
-import tempfile
-import os
+from fastapi import HTTPException
+from app.services.transcription_service import transcribe_file
+from app.utils.upload_spool import spool_upload
 
 def convert_speech_to_text(audio_file):
-    wav_path = None
+    """Transcribes an uploaded clip on the local faster-whisper model; returns text plus word timestamps."""
     try:
         print("📥 Received audio file:", audio_file.filename)
 
-        # Save uploaded file to a temporary .wav file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_wav:
-            temp_wav.write(audio_file.file.read())
-            wav_path = temp_wav.name
-            print("📁 Temporary WAV file saved at:", wav_path)
+        # Stream the upload to the spool in chunks; the file is removed when the block exits
+        with spool_upload(audio_file) as spooled:
+            print("📁 Spooled upload:", spooled.path, f"({spooled.format}, {spooled.size} bytes)")
 
-        recognizer = sr.Recognizer()
+            print("🧠 Transcribing audio...")
+            result = transcribe_file(spooled.path)
+            print("✅ Transcribed Text:", result["text"])
 
-        # Optional: adjust for ambient noise
-        with sr.AudioFile(wav_path) as source:
-            print("🎙️ Adjusting for ambient noise...")
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            print("🎧 Recording audio from file...")
-            audio_data = recognizer.record(source)
+        if not result["words"]:
+            result["text"] = "Speech was unclear. Try speaking more clearly."
+        return result
 
-        # Transcribe using Google Web Speech API
-        print("🧠 Transcribing audio...")
-        text = recognizer.recognize_google(audio_data, language="en-US")
-        print("✅ Transcribed Text:", text)
-
-        return text
-
-    except sr.UnknownValueError:
-        print("❌ Could not understand the audio.")
-        return "Speech was unclear. Try speaking more clearly."
-    except sr.RequestError as e:
-        print(f"🔌 Google Speech API error: {e}")
-        return "Speech recognition service is unavailable."
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"⚠️ Unexpected error: {e}")
-        return f"Error: {str(e)}"
-    finally:
-        if wav_path and os.path.exists(wav_path):
-            os.remove(wav_path)
-            print("🧹 Temporary file deleted:", wav_path)
+        return {"text": f"Error: {str(e)}", "words": [], "duration": 0.0, "speech_duration": 0.0}
@@ -0,0 +1,134 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.skill_matcher import KeywordAutomaton
+
+# Always fillers; hesitation sounds are matched after elongations are collapsed ("ummm" -> "um")
+FILLERS = ("um", "uh", "er", "erm", "ah", "hm", "you know", "i mean", "basically", "actually", "so yeah")
+# Fillers only when set off from the sentence by a comma or a pause ("it was, like, slow"),
+# not when they carry meaning ("I like Python")
+CONTEXT_FILLERS = ("like", "so", "well", "right")
+# A gap of at least this long next to a context filler (word timestamps only) sets it off
+FILLER_PAUSE_SECONDS = 0.3
+# Disfluencies per 100 words at which the fluency score reaches 0
+MAX_DISFLUENCY_RATE = 12.0
+
+_TOKEN = re.compile(r"[\w']+-?")
+_HESITATION = re.compile(r"^(?:u+[mh]+|e+r+m*|a+h+|h+m+)$")
+_ELONGATION = re.compile(r"(\w)\1+")
+_COMMA_AFTER = (",", "...", "…", "—")
+
+_filler_matcher = KeywordAutomaton(FILLERS + CONTEXT_FILLERS)
+_CONTEXT_FILLERS = frozenset(CONTEXT_FILLERS)
+
+
+def _normalize(token: str) -> str:
+    token = token.lower()
+    return _ELONGATION.sub(r"\1", token) if _HESITATION.match(token) else token
+
+
+def _tokenize(text: str, words: Optional[List[dict]]) -> Tuple[List[str], np.ndarray]:
+    """
+    Normalized tokens, and whether each one is set off from its neighbours: a comma just before
+    or after it, or (with word timestamps) a pause of FILLER_PAUSE_SECONDS on either side.
+    """
+    chunks = [word["word"] for word in words] if words else (text or "").split()
+    tokens, break_after = [], []
+    for position, chunk in enumerate(chunks):
+        parts = _TOKEN.findall(chunk)
+        if not parts:
+            continue
+        paused = bool(words) and position + 1 < len(words) and (
+            words[position + 1]["start"] - words[position]["end"] >= FILLER_PAUSE_SECONDS
+        )
+        tokens.extend(_normalize(part) for part in parts)
+        break_after.extend([False] * (len(parts) - 1))
+        break_after.append(paused or chunk.endswith(_COMMA_AFTER))
+    break_after = np.array(break_after, dtype=bool)
+    break_before = np.concatenate(([False], break_after[:-1])) if len(tokens) else break_after
+    return tokens, break_after | break_before
+
+
+def detect_disfluencies_batch(transcripts: Sequence[str], words: Optional[Sequence[Optional[List[dict]]]] = None) -> List[Dict]:
+    """
+    Fillers, repetitions and false starts of several answers in one pass. Each transcript (or
+    its word timestamps, when given) is tokenized once; fillers are found by an Aho-Corasick
+    automaton over the joined tokens, and repetitions by comparing token ids of the whole
+    batch as arrays, so the cost is linear in the total number of words.
+    """
+    words = words or [None] * len(transcripts)
+    vocabulary: Dict[str, int] = {}
+    token_lists, detached_parts = [], []
+    for transcript, timestamps in zip(transcripts, words):
+        tokens, detached = _tokenize(transcript, timestamps)
+        token_lists.append(tokens)
+        detached_parts.append(detached)
+
+    # One array for the batch; each answer is followed by a separator id that matches nothing
+    ids, documents, tokens_flat = [], [], []
+    for document, tokens in enumerate(token_lists):
+        ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+        ids.append(-1 - document)
+        documents.extend([document] * (len(tokens) + 1))
+        tokens_flat.extend(tokens)
+        tokens_flat.append("")
+    ids = np.array(ids, dtype=np.int64)
+    documents = np.array(documents, dtype=np.int64)
+    detached = np.concatenate([np.append(part, False) for part in detached_parts]) if token_lists else np.zeros(0, bool)
+
+    # Fillers: match over the joined tokens, then map character offsets back to token positions
+    joined = " ".join(tokens_flat)
+    token_starts = np.cumsum([0] + [len(token) + 1 for token in tokens_flat[:-1]]) if tokens_flat else np.zeros(0, int)
+    is_filler = np.zeros(len(ids), dtype=bool)
+    fillers = [[] for _ in transcripts]
+    for start, end, filler in _filler_matcher.find(joined):
+        first = int(np.searchsorted(token_starts, start))
+        last = int(np.searchsorted(token_starts, end, side="left"))
+        if filler in _CONTEXT_FILLERS and not detached[first]:
+            continue
+        is_filler[first:last] = True
+        fillers[documents[first]].append(filler)
+
+    # Repetitions: "the the" (same id twice) and "I was I was" (same bigram twice), fillers aside
+    content = ~is_filler
+    repeated_word = np.zeros(len(ids), dtype=bool)
+    repeated_word[1:] = (ids[1:] == ids[:-1]) & content[1:] & content[:-1] & (ids[1:] >= 0)
+    repeated_pair = np.zeros(len(ids), dtype=bool)
+    if len(ids) > 3:
+        repeated_pair[3:] = (
+            (ids[3:] == ids[1:-2]) & (ids[2:-1] == ids[:-3]) & (ids[3:] >= 0) & (ids[2:-1] >= 0)
+            & content[3:] & content[2:-1] & ~repeated_word[3:] & ~repeated_word[2:-1]
+        )
+
+    # False starts: a cut-off word ("impl-") or a fragment set off before the word it starts ("imple, implemented")
+    false_start = np.array([token.endswith("-") for token in tokens_flat], dtype=bool)
+    for index in np.flatnonzero(detached[:-1] & (ids[1:] >= 0) & (ids[:-1] >= 0)):
+        token, following = tokens_flat[index], tokens_flat[index + 1]
+        if 2 <= len(token) < len(following) and following.startswith(token) and not is_filler[index]:
+            false_start[index] = True
+
+    count = len(transcripts)
+    word_counts = np.bincount(documents[ids >= 0], minlength=count)
+    repetition_counts = np.bincount(documents[repeated_word | repeated_pair], minlength=count)
+    false_start_counts = np.bincount(documents[false_start], minlength=count)
+
+    results = []
+    for document in range(count):
+        total = len(fillers[document]) + int(repetition_counts[document]) + int(false_start_counts[document])
+        rate = 100.0 * total / int(word_counts[document]) if word_counts[document] else 0.0
+        results.append({
+            "filler_word_count": len(fillers[document]),
+            "filler_words_list": sorted(set(fillers[document])),
+            "repetition_count": int(repetition_counts[document]),
+            "false_start_count": int(false_start_counts[document]),
+            "disfluencies_per_100_words": round(rate, 1),
+            "fluency_score": round(max(0.0, 1 - rate / MAX_DISFLUENCY_RATE), 2),
+        })
+    return results
+
+
+def detect_disfluencies(transcript: str, words: Optional[List[dict]] = None) -> Dict:
+    """detect_disfluencies_batch for a single answer."""
+    return detect_disfluencies_batch([transcript], [words])[0]
@@ -0,0 +1,45 @@
+import re
+from typing import List
+
+# (rule id, pattern, message, replacement or None). Patterns run case-insensitively unless
+# the rule is about case. Kept to cheap, high-precision checks that suit spoken answers.
+QUICK_RULES = [
+    ("REPEATED_WORD", re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE), "Possible repeated word.", None),
+    ("LOWERCASE_I", re.compile(r"(?<![\w'])i(?=\s|'m\b|'ve\b|'ll\b|'d\b)"), "The pronoun 'I' should be capitalized.", "I"),
+    ("MODAL_OF", re.compile(r"\b(could|should|would|must|might)\s+of\b", re.IGNORECASE),
+     "Use 'have' after a modal verb, not 'of'.", r"\1 have"),
+    ("ALOT", re.compile(r"\balot\b", re.IGNORECASE), "'alot' should be written as 'a lot'.", "a lot"),
+    ("IRREGARDLESS", re.compile(r"\birregardless\b", re.IGNORECASE), "Use 'regardless'.", "regardless"),
+    ("A_AN_VOWEL", re.compile(r"\ba\s+(?=(?:a|e|i|o|u)\w)(?!(?:uni|use|usu|one|eu|ur)\w*)", re.IGNORECASE),
+     "Use 'an' before a vowel sound.", "an "),
+    ("AN_CONSONANT", re.compile(r"\ban\s+(?=[b-df-gj-np-tv-z]\w)(?!(?:hour|honest|honor|heir)\w*)", re.IGNORECASE),
+     "Use 'a' before a consonant sound.", "a "),
+    ("THIRD_PERSON_DONT", re.compile(r"\b(he|she|it)\s+don't\b", re.IGNORECASE), "Use 'doesn't' with he/she/it.", r"\1 doesn't"),
+    ("I_IS", re.compile(r"\bI\s+(is|are)\b"), "Use 'am' with 'I'.", "I am"),
+    ("THEM_ARE", re.compile(r"\b(they|we|you)\s+(is|was)\b", re.IGNORECASE), "Plural subject needs a plural verb.", None),
+    ("THEIR_IS", re.compile(r"\btheir\s+(is|are|was|were)\b", re.IGNORECASE), "Did you mean 'there'?", r"there \1"),
+    ("YOUR_WELCOME", re.compile(r"\byour\s+(welcome|right|going)\b", re.IGNORECASE), "Did you mean 'you're'?", r"you're \1"),
+    ("MORE_BETTER", re.compile(r"\bmore\s+(better|worse|easier|faster|bigger)\b", re.IGNORECASE), "Double comparative.", r"\1"),
+    ("SENTENCE_START_CASE", re.compile(r"(?:^|[.!?]\s+)([a-z])"), "Sentences should start with a capital letter.", None),
+]
+
+
+def check_quick(text: str) -> List[dict]:
+    """Issues found by QUICK_RULES, in the same shape as the LanguageTool issues."""
+    issues = []
+    for rule_id, pattern, message, replacement in QUICK_RULES:
+        for match in pattern.finditer(text):
+            start = match.start(1) if rule_id == "SENTENCE_START_CASE" else match.start()
+            end = match.end(1) if rule_id == "SENTENCE_START_CASE" else match.end()
+            issues.append({
+                "rule_id": rule_id,
+                "message": message,
+                "offset": start,
+                "length": end - start,
+                "replacements": [match.expand(replacement)] if replacement else [],
+            })
+    # One issue per position: "i think" is a lowercase I, not also a lowercase sentence start
+    unique = {}
+    for issue in issues:
+        unique.setdefault(issue["offset"], issue)
+    return sorted(unique.values(), key=lambda issue: issue["offset"])
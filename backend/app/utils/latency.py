@@ -0,0 +1,44 @@
+import threading
+from bisect import bisect_left
+from typing import Optional, Tuple
+
+
+class LatencyHistogram:
+    """Call count, errors and a bucketed latency distribution for one call site."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total_seconds = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, failed: bool = False):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.total_seconds += seconds
+            self.errors += int(failed)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None when open-ended or empty)."""
+        total = sum(self.counts)
+        if not total:
+            return None
+        seen = 0
+        for bound, count in zip(self.buckets + (None,), self.counts):
+            seen += count
+            if seen >= q * total:
+                return bound
+        return None
+
+    def snapshot(self) -> dict:
+        calls = sum(self.counts)
+        labels = [f"le_{bound}" for bound in self.buckets] + ["gt_" + str(self.buckets[-1])]
+        return {
+            "calls": calls,
+            "errors": self.errors,
+            "mean_seconds": round(self.total_seconds / calls, 3) if calls else 0.0,
+            "p50_le_seconds": self.quantile(0.5),
+            "p95_le_seconds": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
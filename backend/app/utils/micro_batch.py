@@ -0,0 +1,88 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+
+class MicroBatcher:
+    """
+    Groups items submitted concurrently (from any thread or coroutine) into batches.
+    A worker thread waits for the first item, keeps collecting for up to max_wait_ms or
+    until max_batch_size items are queued, then calls process_batch(items), which must
+    return one result (or Exception instance) per item in the same order. With workers > 1,
+    that many threads collect and process batches concurrently (e.g. one per pooled backend).
+    """
+
+    def __init__(self, process_batch: Callable[[List], List], max_batch_size: int = 8, max_wait_ms: float = 50, name: str = "batcher",
+                 workers: int = 1):
+        self._process_batch = process_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._name = name
+        self._workers = workers
+        self._threads = []
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self):
+        with self._lock:
+            while len(self._threads) < self._workers:
+                thread = threading.Thread(target=self._run, name=f"{self._name}-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit_future(self, item) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def submit(self, item, timeout: float = None):
+        """Blocks until the item's batch has been processed and returns its result."""
+        return self.submit_future(item).result(timeout)
+
+    async def submit_async(self, item):
+        return await asyncio.wrap_future(self.submit_future(item))
+
+    def backlog(self) -> int:
+        """Items queued and not yet picked up by a worker."""
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            items = [item for item, _ in batch]
+            with self._lock:
+                self.batches += 1
+                self.items += len(items)
+            try:
+                results = self._process_batch(items)
+            except Exception as e:
+                results = [e] * len(items)
+
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,161 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.utils import pitch, vad
+from app.utils.disfluency import detect_disfluencies
+
+# Log-energy histogram used for the adaptive silence threshold (constant memory)
+_HISTOGRAM_BINS = np.linspace(-100.0, 0.0, 201)
+
+
+class RunningStats:
+    """Welford's online mean/variance."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        """Merges a batch of values (Chan et al. parallel update)."""
+        n = len(values)
+        if not n:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
+
+class _Framer:
+    """Cuts a stream of chunks into fixed frames, carrying the remainder between chunks."""
+
+    def __init__(self, frame_length: int, hop_length: int):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self._carry = np.zeros(0, dtype=np.float32)
+
+    def push(self, samples: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate((self._carry, samples))
+        if len(buffer) < self.frame_length:
+            self._carry = buffer
+            return np.zeros((0, self.frame_length), dtype=np.float32)
+        count = (len(buffer) - self.frame_length) // self.hop_length + 1
+        frames = sliding_window_view(buffer, self.frame_length)[::self.hop_length][:count]
+        self._carry = buffer[count * self.hop_length:]
+        return frames
+
+
+class OnlineSpeechAnalyzer:
+    """
+    Incremental version of analyze_speech_signal for audio that arrives in chunks while the
+    candidate is still speaking. Keeps only O(1) state (frame carry-over, an energy histogram,
+    running pitch moments, counters), so memory does not grow with answer length.
+    """
+
+    def __init__(self, sample_rate: int = 16000, min_pause: float = vad.MIN_PAUSE_SECONDS):
+        self.sample_rate = sample_rate
+        self.min_pause = min_pause
+        self.samples_seen = 0
+
+        self._vad_framer = _Framer(int(vad.FRAME_SECONDS * sample_rate), int(vad.HOP_SECONDS * sample_rate))
+        self._pitch_framer = _Framer(pitch.FRAME_LENGTH, pitch.HOP_LENGTH)
+        self._histogram = np.zeros(len(_HISTOGRAM_BINS) - 1, dtype=np.int64)
+
+        self._silent_frames = 0
+        self._seen_speech = False
+        self.pause_count = 0
+        self.hesitation_seconds = 0.0
+
+        self._pitch = RunningStats()
+        self._pitch_change = RunningStats()
+        self._last_f0 = None
+
+        self.word_count = 0
+        self.filler_count = 0
+        self.filler_words = set()
+
+    def threshold(self) -> float:
+        """Adaptive silence threshold from the 10th/90th percentile of the energy seen so far."""
+        total = self._histogram.sum()
+        if not total:
+            return vad.ABSOLUTE_FLOOR
+        cumulative = np.cumsum(self._histogram) / total
+        noise_db, speech_db = _HISTOGRAM_BINS[np.searchsorted(cumulative, [0.1, 0.9]) + 1]
+        noise, speech = 10 ** (noise_db / 20), 10 ** (speech_db / 20)
+        return max(vad.ABSOLUTE_FLOOR, noise + vad.THRESHOLD_RATIO * (speech - noise))
+
+    def feed_audio(self, samples: np.ndarray):
+        samples = np.asarray(samples, dtype=np.float32)
+        self.samples_seen += len(samples)
+        self._update_pauses(self._vad_framer.push(samples))
+        self._update_pitch(self._pitch_framer.push(samples))
+
+    def feed_transcript(self, text: str):
+        """Adds a finalized piece of transcript (not a revision of earlier text)."""
+        self.word_count += len(text.split())
+        disfluency = detect_disfluencies(text)
+        self.filler_count += disfluency["filler_word_count"]
+        self.filler_words.update(disfluency["filler_words_list"])
+
+    def _update_pauses(self, frames: np.ndarray):
+        if not len(frames):
+            return
+        rms = np.sqrt(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frames.shape[1])
+        self._histogram += np.histogram(20 * np.log10(np.maximum(rms, 1e-5)), _HISTOGRAM_BINS)[0]
+        silent = rms < self.threshold()
+
+        # Walk runs rather than frames: a handful per chunk
+        edges = np.flatnonzero(np.diff(silent.astype(np.int8))) + 1
+        bounds = np.concatenate(([0], edges, [len(silent)]))
+        hop = self._vad_framer.hop_length / self.sample_rate
+        overlap = (self._vad_framer.frame_length - self._vad_framer.hop_length) / self.sample_rate
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if silent[start]:
+                self._silent_frames += end - start
+                continue
+            if self._silent_frames and self._seen_speech:
+                gap = self._silent_frames * hop + overlap
+                if gap >= self.min_pause:
+                    self.pause_count += 1
+                    self.hesitation_seconds += float(gap)
+            self._silent_frames = 0
+            self._seen_speech = True
+
+    def _update_pitch(self, frames: np.ndarray):
+        if not len(frames):
+            return
+        rms = np.sqrt(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frames.shape[1])
+        voiced = frames[rms >= self.threshold()]
+        if not len(voiced):
+            return
+        f0 = pitch.yin_frames(voiced, self.sample_rate, pitch.FMIN, pitch.FMAX)
+        f0 = f0[np.isfinite(f0)]
+        if not len(f0):
+            return
+        self._pitch.update(f0)
+        chained = f0 if self._last_f0 is None else np.concatenate(([self._last_f0], f0))
+        self._pitch_change.update(np.diff(chained))
+        self._last_f0 = float(f0[-1])
+
+    def summary(self) -> dict:
+        """Speech analysis in the same shape analyze_speech_signal returns."""
+        duration = self.samples_seen / self.sample_rate
+        return {
+            "clarity_score": round(max(0.0, 1 - self.pause_count / (self.word_count + 1)), 2),
+            "speech_speed_wpm": round(self.word_count / duration * 60) if duration else 0,
+            "pause_count": self.pause_count,
+            "hesitation_duration_seconds": round(self.hesitation_seconds, 2),
+            "pitch_variability": round(self._pitch.std, 2),
+            "tone_stability": round(1 - self._pitch_change.std, 2),
+            "filler_word_count": self.filler_count,
+            "filler_words_list": sorted(self.filler_words),
+            "duration_seconds": round(duration, 2),
+        }
@@ -0,0 +1,152 @@
+"""
+Pluggable pitch tracking for the speech analysis.
+
+Backends (select with PITCH_BACKEND):
+- "pyin":       librosa.pyin, the reference (slowest, probabilistic voicing).
+- "yin":        vectorized YIN over batches of strided frames, FFT-based difference function.
+- "yin_voiced": YIN on a 2x decimated (8 kHz) signal, only on frames the energy VAD marks as voiced.
+
+All backends return f0 in Hz per frame (NaN when unvoiced) at the same frame rate as pyin's
+defaults, so pitch_variability and tone_stability are computed the same way.
+
+Tolerance against pyin (checked by benchmarks/bench_pitch.py): on frames both mark voiced the
+f0 estimates agree within 3%. pitch_variability stays within PITCH_VARIABILITY_TOLERANCE (10%,
+relative). The frame-to-frame f0 spread behind tone_stability (1 - tone_stability) stays within
+TONE_STABILITY_TOLERANCE (25%, relative); it runs lower than pyin because pyin's voicing HMM
+carries f0 a few frames into the silence after each phrase, which YIN leaves unvoiced.
+"""
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.utils.vad import frame_rms, silence_threshold
+
+PITCH_BACKEND = os.getenv("PITCH_BACKEND", "pyin")
+PITCH_BACKENDS = ("pyin", "yin", "yin_voiced")
+
+# C2 and C7, the range the pyin call has always used
+FMIN = 65.40639132514966
+FMAX = 2093.004522404789
+
+# pyin's default framing at 16 kHz
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+YIN_THRESHOLD = 0.15
+# Frames processed per FFT batch; bounds memory on long answers
+YIN_BATCH_FRAMES = 256
+
+PITCH_VARIABILITY_TOLERANCE = 0.10
+TONE_STABILITY_TOLERANCE = 0.25
+
+# 31-tap windowed-sinc low-pass at a quarter of the sample rate, for 2x decimation
+_HALFBAND = np.sinc(np.arange(-15, 16) / 2) * np.hamming(31)
+_HALFBAND = (_HALFBAND / _HALFBAND.sum()).astype(np.float32)
+
+
+def _frames(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """Centred, strided frame view with the same frame count librosa uses (center=True)."""
+    padded = np.pad(samples, frame_length // 2)
+    if len(padded) < frame_length:
+        padded = np.pad(padded, (0, frame_length - len(padded)))
+    return sliding_window_view(padded, frame_length)[::hop_length]
+
+
+def yin_frames(frames: np.ndarray, sample_rate: int, fmin: float, fmax: float) -> np.ndarray:
+    """YIN f0 for a (n, frame_length) batch of frames; NaN where no periodicity is found."""
+    frame_length = frames.shape[1]
+    min_lag = max(1, int(np.floor(sample_rate / fmax)))
+    max_lag = min(int(np.ceil(sample_rate / fmin)), frame_length // 2 - 1)
+    window = frame_length - max_lag
+    f0 = np.full(len(frames), np.nan)
+
+    n_fft = 1 << int(np.ceil(np.log2(frame_length + window)))
+    for start in range(0, len(frames), YIN_BATCH_FRAMES):
+        block = np.asarray(frames[start:start + YIN_BATCH_FRAMES], dtype=np.float64)
+
+        # d(tau) = E(0) + E(tau) - 2 r(tau), with r from one batched FFT cross-correlation
+        spectrum = np.fft.rfft(block, n_fft, axis=1)
+        head = np.fft.rfft(block[:, :window], n_fft, axis=1)
+        corr = np.fft.irfft(np.conj(head) * spectrum, n_fft, axis=1)[:, :max_lag + 1]
+        energy = np.concatenate((np.zeros((len(block), 1)), np.cumsum(block ** 2, axis=1)), axis=1)
+        lags = np.arange(max_lag + 1)
+        shifted_energy = energy[:, lags + window] - energy[:, lags]
+        diff = np.maximum(shifted_energy[:, :1] + shifted_energy - 2 * corr, 0.0)
+
+        # Cumulative mean normalized difference
+        cumulative = np.cumsum(diff[:, 1:], axis=1)
+        cmnd = np.ones_like(diff)
+        np.divide(diff[:, 1:] * lags[1:], cumulative, out=cmnd[:, 1:], where=cumulative > 0)
+
+        # First local minimum below the threshold inside [min_lag, max_lag)
+        search = cmnd[:, min_lag:max_lag]
+        is_min = np.zeros_like(search, dtype=bool)
+        is_min[:, 1:-1] = (search[:, 1:-1] <= search[:, :-2]) & (search[:, 1:-1] < search[:, 2:])
+        candidates = is_min & (search < YIN_THRESHOLD)
+        voiced = candidates.any(axis=1)
+        tau = np.argmax(candidates, axis=1) + min_lag
+
+        # Parabolic interpolation around the chosen lag
+        rows = np.arange(len(block))
+        left, centre, right = cmnd[rows, tau - 1], cmnd[rows, tau], cmnd[rows, np.minimum(tau + 1, max_lag)]
+        curvature = left - 2 * centre + right
+        shift = np.zeros(len(block))
+        np.divide(left - right, 2 * curvature, out=shift, where=np.abs(curvature) > 1e-12)
+        period = tau + np.clip(shift, -1, 1)
+
+        f0[start:start + len(block)] = np.where(voiced, sample_rate / period, np.nan)
+
+    f0[(f0 < fmin) | (f0 > fmax)] = np.nan
+    return f0
+
+
+def _pyin(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    import librosa
+    f0, _, _ = librosa.pyin(samples, fmin=FMIN, fmax=FMAX, sr=sample_rate, frame_length=FRAME_LENGTH)
+    return f0
+
+
+def _yin(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    frames = _frames(samples, FRAME_LENGTH, HOP_LENGTH)
+    f0 = yin_frames(frames, sample_rate, FMIN, FMAX)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / FRAME_LENGTH)
+    f0[rms < silence_threshold(rms)] = np.nan
+    return f0
+
+
+def _yin_voiced(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    # Voiced-frame mask from the energy VAD at the output frame rate
+    padded = np.pad(samples, FRAME_LENGTH // 2)
+    rms = frame_rms(padded, FRAME_LENGTH, HOP_LENGTH)
+    voiced = rms >= silence_threshold(rms)
+
+    # Decimate 2x: C7 is well under the new Nyquist, and every FFT halves in size
+    decimated = np.convolve(samples, _HALFBAND, mode="same")[::2]
+    frames = _frames(decimated, FRAME_LENGTH // 2, HOP_LENGTH // 2)
+    count = min(len(frames), len(voiced))
+
+    f0 = np.full(len(voiced), np.nan)
+    index = np.flatnonzero(voiced[:count])
+    if len(index):
+        f0[index] = yin_frames(frames[index], sample_rate // 2, FMIN, FMAX)
+    return f0
+
+
+_BACKENDS = {"pyin": _pyin, "yin": _yin, "yin_voiced": _yin_voiced}
+
+
+def track_pitch(samples: np.ndarray, sample_rate: int, backend: str = None) -> np.ndarray:
+    """Per-frame f0 in Hz (NaN when unvoiced) using the configured or given backend."""
+    backend = backend or PITCH_BACKEND
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown pitch backend '{backend}', expected one of {PITCH_BACKENDS}")
+    return _BACKENDS[backend](np.asarray(samples, dtype=np.float32), sample_rate)
+
+
+def pitch_statistics(f0: np.ndarray):
+    """pitch_variability (std of f0) and tone_stability (1 - std of frame-to-frame f0 change)."""
+    voiced = f0[np.isfinite(f0)]
+    pitch_variability = float(np.std(voiced)) if len(voiced) else 0.0
+    tone_stability = 1 - (float(np.std(np.diff(voiced))) if len(voiced) > 1 else 0.0)
+    return pitch_variability, tone_stability
@@ -0,0 +1,40 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at rate_per_minute, holds at most capacity tokens.
+    acquire() blocks only the calling thread until a token is free.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, int(rate_per_minute))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Takes a token and returns 0, or returns the seconds to wait before one is available."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
@@ -0,0 +1,200 @@
+import re
+from typing import Dict, List, Tuple
+
+from app.utils.skill_matcher import soft_skill_matcher, soft_term_matcher, technical_skill_matcher, technical_term_matcher
+
+NOT_FOUND = "Not Found"
+
+# Section heading aliases, matched against whole (short) lines
+SECTION_ALIASES = {
+    "summary": ("summary", "profile", "professional summary", "career objective", "objective", "about me", "profile summary"),
+    "experience": ("experience", "work experience", "professional experience", "employment history", "work history", "employment"),
+    "internships": ("internships", "internship", "internship experience"),
+    "education": ("education", "academic background", "academics", "educational qualifications", "qualifications"),
+    "skills": ("skills", "technical skills", "skills and tools", "core competencies", "technologies", "tech stack",
+               "technical and other skills", "key skills", "soft skills"),
+    "certifications": ("certifications", "certificates", "courses", "certifications and courses", "licenses and certifications",
+                       "trainings", "online courses"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "portfolio", "projects / portfolio"),
+    "awards": ("awards", "achievements", "honors", "honors and awards", "awards and recognition", "accomplishments", "scholarships"),
+    "extracurriculars": ("extracurriculars", "extracurricular activities", "extra-curricular activities", "activities",
+                         "volunteering", "volunteer experience", "leadership", "positions of responsibility"),
+    "research": ("research", "publications", "research and publications", "papers", "patents"),
+}
+_HEADING_TO_SECTION = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING_CLEANUP = re.compile(r"[^a-z/& -]+")
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?:\+?\d[\d\s().-]{8,}\d)")
+LINKEDIN = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/[\w/%-]+", re.IGNORECASE)
+GITHUB = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+", re.IGNORECASE)
+URL = re.compile(r"(?:https?://)?(?:www\.)?[\w-]+\.(?:com|io|dev|me|net|org|in|app)(?:/[\w/.-]*)?", re.IGNORECASE)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+DATE_RANGE = re.compile(rf"{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now|ongoing)|{_DATE}", re.IGNORECASE)
+_ROLE_SEPARATOR = re.compile(r"\s+(?:at|@|\||-|–|,)\s+")
+BULLET = re.compile(r"^\s*(?:[•●▪◦‣∙*·-]|\d+[.)])\s+")
+
+# Weights of the signals behind the confidence score (sum to 1)
+_CONFIDENCE_WEIGHTS = {"skills": 0.3, "projects_or_experience": 0.25, "sections": 0.2, "contact": 0.15, "name": 0.1}
+
+
+def _heading(line: str):
+    """The section a line heads, or None. Headings are short and carry no sentence punctuation."""
+    stripped = line.strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40 or stripped.endswith("."):
+        return None
+    return _HEADING_TO_SECTION.get(_HEADING_CLEANUP.sub("", stripped.lower()).strip())
+
+
+def split_sections(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """(header lines before the first heading, {section: its non-empty lines})."""
+    header, sections, current = [], {}, None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(section, [])
+        elif current is None:
+            header.append(line)
+        else:
+            sections[current].append(line)
+    return header, sections
+
+
+def _entries(lines: List[str]) -> List[List[str]]:
+    """Groups section lines into entries: a non-bullet line after bullets starts a new one."""
+    entries, previous_bullet = [], False
+    for line in lines:
+        bullet = bool(BULLET.match(line))
+        if not entries or (not bullet and previous_bullet):
+            entries.append([])
+        entries[-1].append(BULLET.sub("", line))
+        previous_bullet = bullet
+    return entries
+
+
+def _clean(line: str) -> str:
+    return DATE_RANGE.sub("", line).strip(" |,-–")
+
+
+def _experience(lines: List[str]) -> list:
+    result = []
+    for entry in _entries(lines):
+        duration = DATE_RANGE.search(" ".join(entry[:2]))
+        parts = _ROLE_SEPARATOR.split(_clean(entry[0]), maxsplit=1)
+        details = entry[1:]
+        if len(parts) == 2:
+            title, company = parts
+        elif details and len(details[0]) <= 60:
+            # "Title" on one line, "Company  Dates" on the next
+            title, company, details = parts[0], _clean(details[0]), details[1:]
+        else:
+            title, company = parts[0], ""
+        result.append({
+            "Company Name": company or NOT_FOUND,
+            "Job Title": title or NOT_FOUND,
+            "Duration": duration.group(0) if duration else NOT_FOUND,
+            "Key Responsibilities / Achievements": details or NOT_FOUND,
+        })
+    return result
+
+
+def _education(lines: List[str]) -> list:
+    result = []
+    for entry in _entries(lines):
+        joined = " ".join(entry)
+        duration = DATE_RANGE.search(joined)
+        result.append({
+            "Degree Name": _clean(entry[0]) or NOT_FOUND,
+            "Institution Name": (_clean(entry[1]) if len(entry) > 1 else "") or NOT_FOUND,
+            "Duration": duration.group(0) if duration else NOT_FOUND,
+            "Specialization": NOT_FOUND,
+        })
+    return result
+
+
+def _projects(lines: List[str]) -> list:
+    result = []
+    for entry in _entries(lines):
+        title = _clean(entry[0])
+        description = " ".join(entry[1:])
+        result.append({
+            "Project Title": title or NOT_FOUND,
+            "Description": description or NOT_FOUND,
+            "Tools/Technologies Used": technical_term_matcher.unique(" ".join(entry)) or NOT_FOUND,
+        })
+    return result
+
+
+def _lines_or_not_found(lines: List[str]):
+    return [BULLET.sub("", line) for line in lines] or NOT_FOUND
+
+
+def parse_resume_sections(text: str) -> Tuple[dict, float]:
+    """
+    Rule-based resume parser. Returns the structure prompt_extract_resume_details asks Gemini for
+    (missing parts are "Not Found") and a 0-1 confidence from how much of it could be recognised.
+    """
+    header, sections = split_sections(text)
+    header_text = "\n".join(header)
+
+    name = next((line for line in header[:3] if not EMAIL.search(line) and not PHONE.search(line)
+                 and 1 < len(line.split()) <= 5 and not any(ch.isdigit() for ch in line)), None)
+    email, phone = EMAIL.search(text), PHONE.search(header_text)  # body digits are mostly dates
+    linkedin, github = LINKEDIN.search(text), GITHUB.search(text)
+    website = next((match.group(0) for match in URL.finditer(header_text)
+                    if "linkedin" not in match.group(0).lower() and "github" not in match.group(0).lower()
+                    and not EMAIL.search(match.group(0)) and (not email or match.group(0) not in email.group(0))), None)
+
+    skills_text = "\n".join(sections.get("skills", []))
+    technical = technical_skill_matcher.unique(skills_text) or technical_term_matcher.unique(text)
+    soft = list(dict.fromkeys(soft_skill_matcher.unique(skills_text) + soft_term_matcher.unique(text)))
+
+    parsed = {
+        "Basic Information": {
+            "Name": name or NOT_FOUND,
+            "Contact Details": {
+                "Phone": phone.group(0).strip() if phone else NOT_FOUND,
+                "Email": email.group(0) if email else NOT_FOUND,
+                "Address": NOT_FOUND,
+                "LinkedIn": linkedin.group(0) if linkedin else NOT_FOUND,
+                "Website/Portfolio": website or NOT_FOUND,
+                "GitHub": github.group(0) if github else NOT_FOUND,
+            },
+            "Profile Summary / Objective": " ".join(sections.get("summary", [])) or NOT_FOUND,
+        },
+        "Professional Details": {
+            "Work Experience": _experience(sections.get("experience", [])) or NOT_FOUND,
+            "Internships": _experience(sections.get("internships", [])) or NOT_FOUND,
+        },
+        "Education": _education(sections.get("education", [])) or NOT_FOUND,
+        "Technical and Other Skills": {
+            "Technical Skills": technical or NOT_FOUND,
+            "Soft Skills": soft or NOT_FOUND,
+        },
+        "Certifications and Courses": {
+            "Certifications": _lines_or_not_found(sections.get("certifications", [])),
+            "Online Courses / Trainings": NOT_FOUND,
+        },
+        "Projects / Portfolio": _projects(sections.get("projects", [])) or NOT_FOUND,
+        "Awards and Recognition": {
+            "Honors and Awards": _lines_or_not_found(sections.get("awards", [])),
+            "Scholarships": NOT_FOUND,
+        },
+        "Extracurriculars": _lines_or_not_found(sections.get("extracurriculars", [])),
+        "Research and Publications": _lines_or_not_found(sections.get("research", [])),
+    }
+
+    signals = {
+        "skills": min(1.0, len(technical) / 5),
+        "projects_or_experience": 1.0 if sections.get("projects") or sections.get("experience") or sections.get("internships") else 0.0,
+        "sections": min(1.0, len(sections) / 4),
+        "contact": 1.0 if email or phone else 0.0,
+        "name": 1.0 if name else 0.0,
+    }
+    confidence = sum(_CONFIDENCE_WEIGHTS[key] * value for key, value in signals.items())
+    return parsed, round(confidence, 2)
@@ -0,0 +1,112 @@
+import os
+import re
+import threading
+from io import BytesIO
+from typing import List
+
+from app.utils.stage_graph import get_pool
+
+# === Resume extraction settings ===
+# "pdfium": fast text-layer extraction; "pdfplumber": layout analysis (slower, keeps column order)
+RESUME_PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "pdfium")
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_MB", "10")) * 1024 * 1024
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+# Text beyond this is dropped before it reaches the LLM prompt
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "60000"))
+# pdfplumber documents with at least this many pages are split across the stage process pool
+RESUME_PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", "8"))
+# Pages per process-pool task
+RESUME_PAGES_PER_TASK = int(os.getenv("RESUME_PAGES_PER_TASK", "4"))
+
+_LINE_BREAKS = re.compile(r"\r\n?")
+# PDFium is not thread-safe and concurrent uploads extract on threadpool threads, so all
+# PDFium calls in a process go through this lock (each takes milliseconds per page)
+_PDFIUM_LOCK = threading.Lock()
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when a resume exceeds RESUME_MAX_BYTES."""
+
+
+def _pdfium_pages(file_bytes: bytes, start: int, stop: int) -> List[str]:
+    import pypdfium2 as pdfium
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            texts = []
+            for index in range(start, stop):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                texts.append(_LINE_BREAKS.sub("\n", textpage.get_text_range()))
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+
+def _pdfplumber_pages(file_bytes: bytes, start: int, stop: int) -> List[str]:
+    import pdfplumber
+    with pdfplumber.open(BytesIO(file_bytes), pages=list(range(start + 1, stop + 1))) as pdf:
+        # extract_text() returns None for image-only pages
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+PDF_BACKENDS = {
+    "pdfium": _pdfium_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+
+
+def extract_pdf_pages(file_bytes: bytes, start: int, stop: int, backend: str = RESUME_PDF_BACKEND) -> List[str]:
+    """Text of pages [start, stop); module-level so it can run in the stage process pool."""
+    return PDF_BACKENDS[backend](file_bytes, start, stop)
+
+
+def pdf_page_count(file_bytes: bytes) -> int:
+    import pypdfium2 as pdfium
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def _cap(text: str) -> str:
+    return text[:RESUME_MAX_CHARS].strip()
+
+
+def extract_pdf_text(file_bytes: bytes, backend: str = RESUME_PDF_BACKEND) -> str:
+    """
+    Text of the first RESUME_MAX_PAGES pages. With the pdfplumber backend, long documents are
+    split into page ranges extracted in parallel on the stage process pool. pdfium reads a page
+    in a few milliseconds, less than shipping it to another process costs, so it stays in-process.
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}', expected one of {tuple(PDF_BACKENDS)}")
+    pages = min(pdf_page_count(file_bytes), RESUME_MAX_PAGES)
+    if backend == "pdfium" or pages < RESUME_PARALLEL_MIN_PAGES:
+        return _cap("\n".join(extract_pdf_pages(file_bytes, 0, pages, backend)))
+
+    ranges = [(start, min(start + RESUME_PAGES_PER_TASK, pages)) for start in range(0, pages, RESUME_PAGES_PER_TASK)]
+    pool = get_pool("process")
+    futures = [pool.submit(extract_pdf_pages, file_bytes, start, stop, backend) for start, stop in ranges]
+    return _cap("\n".join(text for future in futures for text in future.result()))
+
+
+def extract_docx_text(file_bytes: bytes) -> str:
+    import docx
+    doc = docx.Document(BytesIO(file_bytes))
+    return _cap("\n".join(para.text for para in doc.paragraphs))
+
+
+def extract_resume_text(file_bytes: bytes, filename: str) -> str:
+    """Plain text of a PDF or DOCX resume; raises ResumeTooLargeError or ValueError (unsupported type)."""
+    if len(file_bytes) > RESUME_MAX_BYTES:
+        raise ResumeTooLargeError(f"Resume exceeds {RESUME_MAX_BYTES // (1024 * 1024)} MB.")
+    if filename.endswith(".pdf"):
+        return extract_pdf_text(file_bytes)
+    if filename.endswith(".docx"):
+        return extract_docx_text(file_bytes)
+    raise ValueError("Unsupported file format.")
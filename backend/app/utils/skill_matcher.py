@@ -0,0 +1,131 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# Canonical spellings; matching is case-insensitive and respects word boundaries.
+# Single letters and short words (C, R, Go, Swift...) are left out on purpose: they would match
+# ordinary prose. Their unambiguous spellings (C++, Golang, SwiftUI...) are in. Skills that are
+# also everyday words are listed in AMBIGUOUS_SKILLS.
+TECHNICAL_SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Golang", "Rust", "Kotlin", "Scala", "Ruby",
+    "PHP", "Perl", "MATLAB", "Dart", "Objective-C", "SwiftUI", "Bash", "Shell Scripting", "PowerShell", "SQL",
+    "NoSQL", "PL/SQL", "HTML", "HTML5", "CSS", "CSS3", "Sass", "Tailwind CSS", "Bootstrap", "React", "React.js",
+    "React Native", "Redux", "Next.js", "Angular", "Vue.js", "Svelte", "jQuery", "Node.js", "Express.js",
+    "Django", "Flask", "FastAPI", "Spring", "Spring Boot", "Hibernate", ".NET", "ASP.NET", "Laravel",
+    "Ruby on Rails", "GraphQL", "REST", "REST APIs", "gRPC", "WebSockets", "Microservices", "MongoDB",
+    "MySQL", "PostgreSQL", "SQLite", "Oracle", "Redis", "Cassandra", "DynamoDB", "Elasticsearch", "Firebase",
+    "Supabase", "Kafka", "RabbitMQ", "Spark", "Apache Spark", "Hadoop", "Airflow", "dbt", "Snowflake",
+    "BigQuery", "Databricks", "AWS", "Azure", "GCP", "Google Cloud", "Docker", "Kubernetes", "Terraform",
+    "Ansible", "Jenkins", "GitHub Actions", "GitLab CI", "CI/CD", "Git", "GitHub", "Linux", "Nginx",
+    "Prometheus", "Grafana", "Machine Learning", "Deep Learning", "NLP", "Natural Language Processing",
+    "Computer Vision", "Reinforcement Learning", "Data Analysis", "Data Science", "Data Structures",
+    "Algorithms", "Statistics", "TensorFlow", "PyTorch", "Keras", "scikit-learn", "Pandas", "NumPy", "SciPy",
+    "Matplotlib", "Seaborn", "OpenCV", "Hugging Face", "Transformers", "LangChain", "LLMs", "XGBoost",
+    "Power BI", "Tableau", "Excel", "Figma", "Android", "iOS", "Flutter", "Unity", "Selenium", "Jest",
+    "PyTest", "JUnit", "Cypress", "Postman", "Jira", "Agile", "Scrum", "OOP", "System Design",
+    "Distributed Systems", "Networking", "Cybersecurity", "Blockchain", "Solidity", "Arduino",
+    "Raspberry Pi", "Embedded Systems", "Verilog", "AutoCAD", "SolidWorks",
+)
+
+SOFT_SKILLS = (
+    "Leadership", "Communication", "Teamwork", "Team Player", "Collaboration", "Problem Solving",
+    "Problem-Solving", "Critical Thinking", "Time Management", "Adaptability", "Creativity",
+    "Public Speaking", "Presentation", "Negotiation", "Conflict Resolution", "Decision Making",
+    "Mentoring", "Project Management", "Attention to Detail", "Interpersonal Skills", "Self-Motivated",
+    "Work Ethic", "Empathy", "Organization", "Multitasking", "Analytical Thinking", "Customer Service",
+)
+
+
+# Also ordinary words ("rest", "spring", "excel at"...): only matched in a resume's skills
+# section and only in this exact casing; prose (whole resumes, answers) never matches them
+AMBIGUOUS_SKILLS = (
+    "REST", "Spring", "Excel", "Statistics", "Agile", "Unity", "Oracle", "Networking", "React", "Spark",
+    "Presentation", "Organization",
+)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed vocabulary: finds every keyword in one pass over the
+    text, however large the vocabulary. Matches must start and end on word boundaries, and a
+    match nested inside a longer overlapping one (React inside React Native) is dropped.
+    Keywords in case_sensitive only match in their canonical casing.
+    """
+
+    def __init__(self, keywords: Iterable[str], case_sensitive: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.keywords = list(dict.fromkeys(keywords))
+        case_sensitive = set(case_sensitive)
+        self._case_sensitive = {index for index, keyword in enumerate(self.keywords) if keyword in case_sensitive}
+        for index, keyword in enumerate(self.keywords):
+            self._insert(keyword.lower(), index)
+        self._build_failure_links()
+
+    def _insert(self, word: str, index: int):
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """(start, end, keyword) for each whole-word match, longest first where they overlap."""
+        lowered = text.lower()
+        state, raw = 0, []
+        for position, ch in enumerate(lowered):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for index in self._out[state]:
+                start = position + 1 - len(self.keywords[index])
+                end = position + 1
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                    continue
+                if end < len(lowered) and _is_word_char(lowered[end]) and _is_word_char(lowered[end - 1]):
+                    continue
+                if index in self._case_sensitive and text[start:end] != self.keywords[index]:
+                    continue
+                raw.append((start, end, self.keywords[index]))
+
+        matches, covered_until = [], -1
+        for start, end, keyword in sorted(raw, key=lambda match: (match[0], match[0] - match[1])):
+            if end <= covered_until:
+                continue
+            matches.append((start, end, keyword))
+            covered_until = max(covered_until, end)
+        return matches
+
+    def unique(self, text: str) -> List[str]:
+        """Distinct keywords found in text, in order of first appearance."""
+        return list(dict.fromkeys(keyword for _, _, keyword in self.find(text)))
+
+
+# For skills sections
+technical_skill_matcher = KeywordAutomaton(TECHNICAL_SKILLS, case_sensitive=AMBIGUOUS_SKILLS)
+soft_skill_matcher = KeywordAutomaton(SOFT_SKILLS, case_sensitive=AMBIGUOUS_SKILLS)
+# For prose: whole resumes, experience entries, interview answers
+technical_term_matcher = KeywordAutomaton(skill for skill in TECHNICAL_SKILLS if skill not in AMBIGUOUS_SKILLS)
+soft_term_matcher = KeywordAutomaton(skill for skill in SOFT_SKILLS if skill not in AMBIGUOUS_SKILLS)
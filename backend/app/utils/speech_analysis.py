@@ -0,0 +1,39 @@
+from typing import List, Optional
+from app.utils.audio_buffer import AudioBuffer
+from app.utils.pitch import pitch_statistics, track_pitch
+from app.utils.vad import detect_pauses
+
+
+def speaking_rate(words: List[dict]) -> int:
+    """Words per minute over the span actually spoken, from transcription word timestamps."""
+    span = words[-1]["end"] - words[0]["start"] if words else 0
+    return round(len(words) / span * 60) if span > 0 else 0
+
+def analyze_speech_signal(audio_buffer: AudioBuffer, transcript: str, words: Optional[List[dict]] = None):
+    """
+    CPU-bound part of the audio analysis (speech rate, pauses, pitch) on an already decoded buffer.
+    Kept free of model globals so it can run in a separate worker process. When the transcription's
+    word timestamps are given, the speech rate comes from them instead of the clip length.
+    """
+    waveform, sr = audio_buffer.samples, audio_buffer.sample_rate
+    total_words = len(words) if words else len(transcript.split())
+    duration = audio_buffer.duration
+    wpm = speaking_rate(words) if words else round((total_words / duration) * 60)
+
+    # Pause calculation from frame-energy silence intervals
+    pause_stats = detect_pauses(waveform, sr)
+    pause_count = pause_stats["pause_count"]
+    hesitation_duration = pause_stats["hesitation_duration_seconds"]
+
+    # Pitch (backend chosen by PITCH_BACKEND)
+    f0 = track_pitch(waveform, sr)
+    pitch_variability, tone_stability = pitch_statistics(f0)
+
+    return {
+        "clarity_score": round(max(0.0, 1 - (pause_count) / (total_words + 1)), 2),
+        "speech_speed_wpm": wpm,
+        "pause_count": pause_count,
+        "hesitation_duration_seconds": round(hesitation_duration, 2),
+        "pitch_variability": round(pitch_variability, 2),
+        "tone_stability": round(tone_stability, 2),
+    }
@@ -0,0 +1,18 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from app.services.job_queue import Job
+
+
+def job_event_response(job: Job) -> StreamingResponse:
+    """Server-Sent Events stream of a job's events, with keep-alive comments while it is quiet."""
+    async def event_source():
+        async for event in job.stream():
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['event']}\ndata: {json.dumps(jsonable_encoder(event['data']))}\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple
+
+# === Stage pools ===
+STAGE_THREAD_WORKERS = int(os.getenv("STAGE_THREAD_WORKERS", "8"))
+STAGE_PROCESS_WORKERS = int(os.getenv("STAGE_PROCESS_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+POOLS = ("thread", "process", "inline")
+
+_thread_pool = None
+_process_pool = None
+
+
+def get_pool(kind: str):
+    """Lazily creates the shared pools; processes are spawned so they never inherit loaded models."""
+    global _thread_pool, _process_pool
+    if kind == "thread":
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=STAGE_THREAD_WORKERS, thread_name_prefix="stage")
+        return _thread_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=STAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def _timed(fn: Callable, args: tuple, kwargs: dict):
+    """Runs one stage and measures its own execution time (module level so it pickles)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class StageGraph:
+    """
+    Small dependency graph of pipeline stages. Each stage runs as soon as its
+    dependencies have finished, on the pool that suits it: "thread" for I/O
+    (DB, LLM calls), "process" for CPU-bound DSP, "inline" for cheap joins.
+    Extra keyword arguments and dependency results (named after the dependency) are passed
+    to the stage as keyword arguments.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable, tuple, dict, tuple, str]] = {}
+
+    def add(self, name: str, fn: Callable, *args, deps: tuple = (), pool: str = "thread", **kwargs):
+        if pool not in POOLS:
+            raise ValueError(f"Unknown pool '{pool}', expected one of {POOLS}")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {missing}")
+        self._stages[name] = (fn, args, kwargs, tuple(deps), pool)
+        return self
+
+    def run(self, on_stage: Optional[Callable[[str, object], None]] = None):
+        """
+        Executes every stage and returns (results, timings). timings holds the run time of
+        each stage in seconds plus "total" for the whole graph. The first failing stage
+        cancels whatever has not started yet and its exception is re-raised.
+        """
+        results, timings = {}, {}
+        pending = dict(self._stages)
+        running = {}
+        graph_start = time.perf_counter()
+
+        def finish(name, result, elapsed):
+            results[name] = result
+            timings[name] = round(elapsed, 4)
+            if on_stage:
+                on_stage(name, result)
+
+        while pending or running:
+            ready = [name for name, (_, _, _, deps, _) in pending.items() if all(dep in results for dep in deps)]
+            for name in ready:
+                fn, args, kwargs, deps, pool = pending.pop(name)
+                kwargs = {**kwargs, **{dep: results[dep] for dep in deps}}
+                if pool == "inline":
+                    result, elapsed = _timed(fn, args, kwargs)
+                    finish(name, result, elapsed)
+                else:
+                    running[get_pool(pool).submit(_timed, fn, args, kwargs)] = name
+
+            if not running:
+                if pending and not ready:
+                    raise RuntimeError(f"Stages {list(pending)} can never run")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result, elapsed = future.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+                finish(name, result, elapsed)
+
+        timings["total"] = round(time.perf_counter() - graph_start, 4)
+        return results, timings
@@ -0,0 +1,121 @@
+import mmap
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+# === Upload spool settings ===
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "nextgen-uploads"))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+MAX_AUDIO_UPLOAD_BYTES = int(os.getenv("MAX_AUDIO_UPLOAD_MB", "50")) * 1024 * 1024
+SPOOL_MAX_TOTAL_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_MB", "2048")) * 1024 * 1024
+SPOOL_STALE_SECONDS = int(os.getenv("UPLOAD_SPOOL_STALE_SECONDS", "3600"))
+# Decode spooled audio from a read-only memory map instead of reopening the path
+UPLOAD_USE_MMAP = os.getenv("UPLOAD_USE_MMAP", "0") == "1"
+
+
+def sniff_audio_format(header: bytes) -> Optional[str]:
+    """Identifies the container from its first bytes; None if it is not a supported audio file."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[4:8] == b"ftyp":
+        return "mp4"
+    if header[:3] == b"ID3" or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+
+class SpooledAudio:
+    """An upload written to the spool directory. Use as a context manager to guarantee removal."""
+
+    def __init__(self, path: str, size: int, audio_format: str):
+        self.path = path
+        self.size = size
+        self.format = audio_format
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def mmap(self):
+        """Read-only memory map of the spooled file; pages are loaded on demand, not copied."""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+
+def _spool_usage() -> int:
+    total = 0
+    for entry in os.scandir(UPLOAD_SPOOL_DIR):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+def sweep_spool(max_age_seconds: int = SPOOL_STALE_SECONDS) -> int:
+    """Deletes spool files older than max_age_seconds (left behind by crashed workers)."""
+    os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+    cutoff, removed = time.time() - max_age_seconds, 0
+    for entry in os.scandir(UPLOAD_SPOOL_DIR):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def spool_upload(upload: UploadFile, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES) -> SpooledAudio:
+    """
+    Streams an audio upload to the spool directory in fixed-size chunks, so memory stays flat
+    however long the recording is. The format is checked from the header before anything is
+    written; oversized uploads (413), unknown formats (415) and a full spool (503) are rejected.
+    Blocking: call from a threadpool (e.g. starlette's run_in_threadpool) in async routes.
+    """
+    os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+    upload.file.seek(0)
+    chunk = upload.file.read(UPLOAD_CHUNK_BYTES)
+    audio_format = sniff_audio_format(chunk[:12])
+    if audio_format is None:
+        raise HTTPException(status_code=415, detail="Unsupported audio format.")
+
+    if _spool_usage() + len(chunk) > SPOOL_MAX_TOTAL_BYTES:
+        sweep_spool()
+        if _spool_usage() + len(chunk) > SPOOL_MAX_TOTAL_BYTES:
+            raise HTTPException(status_code=503, detail="Upload spool is full, please retry shortly.")
+
+    path = os.path.join(UPLOAD_SPOOL_DIR, f"{uuid.uuid4().hex}.{audio_format}")
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Audio upload exceeds {max_bytes // (1024 * 1024)} MB.")
+                out.write(chunk)
+                chunk = upload.file.read(UPLOAD_CHUNK_BYTES)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    return SpooledAudio(path, size, audio_format)
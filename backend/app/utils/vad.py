@@ -0,0 +1,71 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# === Energy VAD settings ===
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+MIN_PAUSE_SECONDS = 0.5
+# Silence threshold sits this fraction of the way from the noise floor to the speech level
+THRESHOLD_RATIO = 0.1
+# Never treat anything above about -60 dBFS as silence on its own
+ABSOLUTE_FLOOR = 1e-3
+
+
+def frame_rms(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Short-time RMS of every frame in one vectorized pass. Frames are strided views into
+    samples, so no (n_frames, frame_length) copy is made; einsum reduces them in place.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    frames = sliding_window_view(samples, frame_length)[::hop_length]
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+    return np.sqrt(energy / frame_length)
+
+
+def silence_threshold(rms: np.ndarray) -> float:
+    """Adaptive threshold between the noise floor (10th pct) and the speech level (90th pct)."""
+    noise_floor, speech_level = np.percentile(rms, [10, 90])
+    return max(ABSOLUTE_FLOOR, noise_floor + THRESHOLD_RATIO * (speech_level - noise_floor))
+
+
+def silence_intervals(samples: np.ndarray, sample_rate: int, threshold: float = None) -> np.ndarray:
+    """Returns an (n, 2) array of [start, end) silence intervals in seconds."""
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    hop_length = int(HOP_SECONDS * sample_rate)
+    rms = frame_rms(samples, frame_length, hop_length)
+    if threshold is None:
+        threshold = silence_threshold(rms)
+
+    silent = np.concatenate(([False], rms < threshold, [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+
+    # Frame i covers [i * hop, i * hop + frame), so a run of silent frames s..e-1 spans
+    # [s * hop, (e - 1) * hop + frame): exact to within one hop on either side
+    duration = len(samples) / sample_rate
+    intervals = np.column_stack((starts * hop_length, (ends - 1) * hop_length + frame_length)) / sample_rate
+    intervals[:, 0][starts == 0] = 0.0
+    intervals[:, 1][ends == len(rms)] = duration
+    return np.clip(intervals, 0.0, duration)
+
+
+def detect_pauses(samples: np.ndarray, sample_rate: int, min_pause: float = MIN_PAUSE_SECONDS) -> dict:
+    """
+    Pauses are silences of at least min_pause seconds between speech; leading and
+    trailing silence (before the first word / after the last) is not counted.
+    """
+    duration = len(samples) / sample_rate
+    silences = silence_intervals(samples, sample_rate)
+    lengths = silences[:, 1] - silences[:, 0]
+    inner = (silences[:, 0] > 0.0) & (silences[:, 1] < duration)
+    pauses = silences[inner & (lengths >= min_pause)]
+    pause_lengths = pauses[:, 1] - pauses[:, 0]
+
+    return {
+        "pauses": pauses,
+        "pause_count": int(len(pauses)),
+        "hesitation_duration_seconds": float(pause_lengths.sum()),
+        "speech_duration_seconds": float(duration - lengths.sum()),
+    }
@@ -0,0 +1,96 @@
+"""
+Benchmark: interview reads as the routes issue them, before and after the async repositories.
+
+Run from backend/:  python benchmarks/bench_async_db.py [--requests 2000] [--concurrency 1 16 64]
+Needs a MongoDB at MONGO_URI; seeds (and drops) the bench_async_db collection. Each simulated
+request is get_next_question's read (questions plus one sliced sample answer):
+
+  blocking    pymongo called inside an async def route, as analyze-feedback and the session
+              routes did: the event loop waits for every round-trip
+  threadpool  pymongo in a plain def route, which Starlette runs in its 40-thread pool
+  async       app.repositories.InterviewRepository on the async client
+
+Pool size and timeouts come from the MONGO_* settings in app/database.py.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.database import async_client, client  # noqa: E402
+from app.repositories import InterviewRepository  # noqa: E402
+
+DATABASE = "nextgen_db"
+COLLECTION = "bench_async_db"
+INTERVIEWS = 200
+
+
+def seed():
+    collection = client[DATABASE][COLLECTION]
+    collection.drop()
+    collection.create_index("interview_id", unique=True)
+    collection.insert_many([
+        {
+            "interview_id": f"bench-{number}",
+            "questions": [f"Question {index} about distributed systems?" for index in range(10)],
+            "sample_answers": ["A detailed sample answer. " * 40 for _ in range(10)],
+            "sample_answers_status": "ready",
+        }
+        for number in range(INTERVIEWS)
+    ])
+
+
+def projection(index: int) -> dict:
+    return {"_id": 0, "questions": 1, "sample_answers": {"$slice": [index, 1]}, "sample_answers_status": 1}
+
+
+async def run(mode: str, requests: int, concurrency: int) -> float:
+    sync_collection = client[DATABASE][COLLECTION]
+    repository = InterviewRepository({"interviews": async_client[DATABASE][COLLECTION]})
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(number: int):
+        interview_id, index = f"bench-{number % INTERVIEWS}", number % 10
+        async with semaphore:
+            if mode == "blocking":
+                sync_collection.find_one({"interview_id": interview_id}, projection(index))
+            elif mode == "threadpool":
+                await run_in_threadpool(sync_collection.find_one, {"interview_id": interview_id}, projection(index))
+            else:
+                await repository.get(interview_id, {key: value for key, value in projection(index).items() if key != "_id"})
+
+    await asyncio.gather(*(request(number) for number in range(min(50, requests))))  # warm up pools
+    start = time.perf_counter()
+    await asyncio.gather(*(request(number) for number in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def compare(requests: int, concurrency_levels):
+    # One event loop throughout: the async client stays bound to the loop it first ran on
+    print(f"{'concurrency':>11} {'blocking':>10} {'threadpool':>11} {'async':>10}   (requests/s)")
+    for concurrency in concurrency_levels:
+        rates = [await run(mode, requests, concurrency) for mode in ("blocking", "threadpool", "async")]
+        print(f"{concurrency:>11} {rates[0]:>10.0f} {rates[1]:>11.0f} {rates[2]:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    args = parser.parse_args()
+    if not os.getenv("MONGO_URI"):
+        sys.exit("Set MONGO_URI to a MongoDB the benchmark may write to.")
+
+    seed()
+    try:
+        asyncio.run(compare(args.requests, args.concurrency))
+    finally:
+        client[DATABASE][COLLECTION].drop()
+
+
+if __name__ == "__main__":
+    main()
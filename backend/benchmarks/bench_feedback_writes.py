@@ -0,0 +1,137 @@
+"""
+Load test: saving one answer's feedback as attempts pile up, legacy read-modify-write of the
+whole attempts array vs the positional $push in app.services.feedback_store.
+
+Run from backend/:  python benchmarks/bench_feedback_writes.py [--attempts 20] [--questions 5] [--concurrency 4]
+Needs a MongoDB at MONGO_URI; uses (and drops) the bench_feedback_writes collection. Bytes are
+measured with pymongo command monitoring: what each save sends to and receives from the server.
+Each answer carries a ~4.5 KB review, like the 500-700 word Gemini review. With --concurrency,
+the answers of an attempt are saved from that many threads at once; the legacy path then loses
+answers to lost updates, which the "stored" column shows.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import bson
+from pymongo import MongoClient, monitoring
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.services import feedback_store  # noqa: E402
+
+REVIEW = ("Your answer covered the main points but could go deeper into trade-offs. " * 60)[:4500]
+
+
+class ByteCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.local = threading.local()
+
+    def reset(self):
+        self.local.sent = self.local.received = 0
+
+    def started(self, event):
+        self.local.sent = getattr(self.local, "sent", 0) + len(bson.encode(event.command))
+
+    def succeeded(self, event):
+        self.local.received = getattr(self.local, "received", 0) + len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+
+def question_feedback(question_index: int) -> dict:
+    return {
+        "question_index": question_index,
+        "user_answer_text": "I would shard the table by tenant and cache hot reads.",
+        "timestamp": datetime.utcnow().isoformat(),
+        "answer_duration_seconds": 42.0,
+        "feedback": {"text_analysis": {"relevance_score": 0.8}, "overall_review": REVIEW},
+        "overall_comments": REVIEW,
+        "sample_answer": "A sample answer of moderate length. " * 20,
+    }
+
+
+def legacy_save(collection, interview_id, user_id, feedback):
+    """What process_answer_feedback did before: read everything, append in Python, $set it all back."""
+    existing = collection.find_one({"interview_id": interview_id, "user_id": user_id})
+    attempts = existing.get("attempts", [])
+    latest = attempts[-1]
+    if not any(q["question_index"] == feedback["question_index"] for q in latest["questions_feedback"]):
+        latest["questions_feedback"].append(feedback)
+        collection.update_one({"interview_id": interview_id, "user_id": user_id}, {"$set": {"attempts": attempts}})
+
+
+def legacy_start(collection, interview_id, user_id):
+    existing = collection.find_one({"interview_id": interview_id, "user_id": user_id})
+    number = len(existing["attempts"]) + 1 if existing else 1
+    if existing:
+        collection.update_one({"interview_id": interview_id, "user_id": user_id},
+                              {"$push": {"attempts": {"attempt_number": number, "questions_feedback": []}}})
+    else:
+        collection.insert_one({"interview_id": interview_id, "user_id": user_id,
+                               "attempts": [{"attempt_number": number, "questions_feedback": []}]})
+    return number
+
+
+def run(method, collection, counter, attempts, questions, concurrency):
+    interview_id, user_id = f"bench-{method}", "bench-user"
+    collection.delete_many({"interview_id": interview_id})
+    rows = []
+    for _ in range(attempts):
+        if method == "legacy":
+            number = legacy_start(collection, interview_id, user_id)
+        else:
+            number = feedback_store.start_attempt(interview_id, user_id)
+
+        def save(index):
+            counter.reset()
+            start = time.perf_counter()
+            if method == "legacy":
+                legacy_save(collection, interview_id, user_id, question_feedback(index))
+            else:
+                feedback_store.append_question_feedback(interview_id, user_id, number, question_feedback(index))
+            return time.perf_counter() - start, counter.local.sent, counter.local.received
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(pool.map(save, range(questions)))
+        session = collection.find_one({"interview_id": interview_id, "user_id": user_id}, {"attempts": {"$slice": -1}})
+        stored = len(session["attempts"][0]["questions_feedback"])
+        rows.append((number, samples, stored))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    if not os.getenv("MONGO_URI"):
+        sys.exit("Set MONGO_URI to a MongoDB the benchmark may write to.")
+    counter = ByteCounter()
+    client = MongoClient(os.getenv("MONGO_URI"), event_listeners=[counter], serverSelectionTimeoutMS=5000)
+    collection = client["nextgen_db"]["bench_feedback_writes"]
+    feedback_store.feedback_collection = collection
+
+    try:
+        for method in ("legacy", "push"):
+            print(f"\n{method}: per-answer save as attempts accumulate")
+            print(f"{'attempt':>8} {'mean ms':>8} {'max ms':>8} {'sent KB':>8} {'recv KB':>8} {'stored':>7}")
+            for number, samples, stored in run(method, collection, counter, args.attempts, args.questions, args.concurrency):
+                if number in (1, 2, 5) or number % 5 == 0:
+                    latencies = [latency for latency, _, _ in samples]
+                    sent = sum(sent for _, sent, _ in samples) / len(samples) / 1024
+                    received = sum(received for _, _, received in samples) / len(samples) / 1024
+                    print(f"{number:>8} {sum(latencies) / len(latencies) * 1000:>8.1f} {max(latencies) * 1000:>8.1f} "
+                          f"{sent:>8.1f} {received:>8.1f} {stored:>4}/{args.questions}")
+    finally:
+        collection.drop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: pitch backends (app.utils.pitch) on 1, 5 and 10 minute clips.
+
+Run from backend/:  python benchmarks/bench_pitch.py [--skip-pyin-over MINUTES]
+Reports seconds of audio processed per second of CPU for each backend and checks that
+pitch_variability / tone_stability of the YIN backends stay within the documented
+tolerance of pyin. Clips are synthetic voiced speech: harmonic bursts with gliding,
+vibrato-modulated f0 between 90 and 260 Hz, separated by short silences.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.pitch import (  # noqa: E402
+    PITCH_VARIABILITY_TOLERANCE, TONE_STABILITY_TOLERANCE, pitch_statistics, track_pitch,
+)
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_speech(minutes, seed=0):
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    chunks, length = [], 0
+    while length < total:
+        n = int(rng.uniform(0.8, 3.0) * SAMPLE_RATE)
+        t = np.arange(n) / SAMPLE_RATE
+        base = rng.uniform(90, 260)
+        f0 = base * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.3, 1.0) * t)) * (1 + 0.02 * np.sin(2 * np.pi * 5 * t))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6)) * 0.2 * np.hanning(n) ** 0.2
+        silence = rng.normal(0, 1e-4, int(rng.uniform(0.2, 1.0) * SAMPLE_RATE))
+        chunks += [voiced, silence]
+        length += n + len(silence)
+    return np.concatenate(chunks)[:total].astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skip-pyin-over", type=float, default=float("inf"),
+                        help="skip pyin on clips longer than this many minutes")
+    args = parser.parse_args()
+
+    print(f"{'clip':>5} {'backend':>11} {'time (s)':>9} {'x realtime':>11} {'pitch_var':>10} {'tone_stab':>10} {'within tol':>11}")
+    for minutes in (1, 5, 10):
+        samples = synthetic_speech(minutes)
+        reference = None
+        for backend in ("pyin", "yin", "yin_voiced"):
+            if backend == "pyin" and minutes > args.skip_pyin_over:
+                continue
+            start = time.perf_counter()
+            f0 = track_pitch(samples, SAMPLE_RATE, backend)
+            elapsed = time.perf_counter() - start
+            variability, stability = pitch_statistics(f0)
+            if backend == "pyin":
+                reference = (variability, stability)
+                verdict = "reference"
+            elif reference is None:
+                verdict = "n/a"
+            else:
+                spread, reference_spread = 1 - stability, 1 - reference[1]
+                ok = (abs(variability - reference[0]) <= PITCH_VARIABILITY_TOLERANCE * reference[0]
+                      and abs(spread - reference_spread) <= TONE_STABILITY_TOLERANCE * abs(reference_spread))
+                verdict = "yes" if ok else "NO"
+            print(f"{minutes:>4}m {backend:>11} {elapsed:>9.2f} {minutes * 60 / elapsed:>11.1f} "
+                  f"{variability:>10.2f} {stability:>10.3f} {verdict:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: resume text extraction (app.utils.resume_text) vs the previous pdfplumber `text +=` path.
+
+Run from backend/:  python benchmarks/bench_resume_extract.py [--pages 2 10 40] [--repeat 3]
+Builds a synthetic corpus in a temp directory: multi-page text PDFs (one page of each left
+image-only, i.e. without a text layer) and DOCX files of similar length. The resume LLM call
+is not part of the measurement. Page-parallel pdfplumber only pays off with
+STAGE_PROCESS_WORKERS > 1 (it defaults to half the CPU count).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils import resume_text  # noqa: E402
+
+LINE = "Built a streaming data pipeline in Python and Kafka, cutting report latency by 40 percent."
+LINES_PER_PAGE = 45
+
+
+def build_pdf(pages: int) -> bytes:
+    """A plain PDF with Helvetica text on every page except the middle one (no text layer)."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        if page == pages // 2:
+            content = b"0.5 g 72 72 450 650 re f"  # a filled box standing in for a scanned page
+        else:
+            rows = [f"({f'Page {page + 1} line {row}: {LINE}'}) Tj T*".encode() for row in range(LINES_PER_PAGE)]
+            content = b"BT /F1 9 Tf 11 TL 40 780 Td " + b" ".join(rows) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def build_docx(pages: int) -> bytes:
+    import docx
+    document = docx.Document()
+    for page in range(pages):
+        for row in range(LINES_PER_PAGE):
+            document.add_paragraph(f"Page {page + 1} line {row}: {LINE}")
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def legacy_pdf(file_bytes: bytes) -> str:
+    """extract_text_from_pdf as it was before app.utils.resume_text."""
+    import pdfplumber
+    text = ""
+    with pdfplumber.open(BytesIO(file_bytes)) as pdf:
+        for page in pdf.pages:
+            text += page.extract_text() + "\n"
+    return text.strip()
+
+
+def legacy_docx(file_bytes: bytes) -> str:
+    import docx
+    doc = docx.Document(BytesIO(file_bytes))
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+def measure(fn, file_bytes: bytes, repeat: int):
+    best, text, error = float("inf"), "", None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            text = fn(file_bytes)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            break
+        best = min(best, time.perf_counter() - start)
+    return best, len(text), error
+
+
+def serial(backend):
+    def run(file_bytes):
+        pages = min(resume_text.pdf_page_count(file_bytes), resume_text.RESUME_MAX_PAGES)
+        return "\n".join(resume_text.extract_pdf_pages(file_bytes, 0, pages, backend))
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 40])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    resume_text.RESUME_MAX_PAGES = max(args.pages)
+    resume_text.RESUME_MAX_CHARS = 10 ** 9
+
+    pdf_methods = [
+        ("legacy pdfplumber +=", legacy_pdf),
+        ("pdfplumber, serial", serial("pdfplumber")),
+        ("pdfium, serial", serial("pdfium")),
+        ("pdfium, engine", lambda b: resume_text.extract_pdf_text(b, "pdfium")),
+        ("pdfplumber, engine", lambda b: resume_text.extract_pdf_text(b, "pdfplumber")),
+    ]
+    docx_methods = [("legacy docx", legacy_docx), ("engine docx", resume_text.extract_docx_text)]
+
+    # Start the process pool up front so the first parallel run does not pay for spawning it
+    resume_text.get_pool("process").submit(len, b"").result()
+
+    with tempfile.TemporaryDirectory() as corpus:
+        print(f"{'file':<17}{'method':<24}{'best s':>9}{'chars':>9}  note")
+        for pages in args.pages:
+            for kind, build, methods in (("pdf", build_pdf, pdf_methods), ("docx", build_docx, docx_methods)):
+                name = f"resume_{pages}p.{kind}"
+                path = os.path.join(corpus, name)
+                with open(path, "wb") as f:
+                    f.write(build(pages))
+                with open(path, "rb") as f:
+                    file_bytes = f.read()
+                for label, fn in methods:
+                    best, chars, error = measure(fn, file_bytes, args.repeat)
+                    note = error or ("parallel" if label == "pdfplumber, engine"
+                                     and pages >= resume_text.RESUME_PARALLEL_MIN_PAGES else "")
+                    shown = f"{best:>9.3f}" if error is None else f"{'-':>9}"
+                    print(f"{name:<17}{label:<24}{shown}{chars:>9}  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: frame-energy VAD (app.utils.vad) vs the previous fixed-timestamp pause logic.
+
+Run from backend/:  python benchmarks/bench_vad.py
+Uses synthetic 16 kHz speech-like clips (tone bursts with known silences) of 1, 5 and 10 minutes.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.vad import detect_pauses  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def legacy_pauses(waveform, sr):
+    """The pause logic analyze_audio_features used before the VAD."""
+    timestamps = [i / sr for i in range(0, len(waveform), sr // 2)]
+    pauses = [timestamps[i + 1] - timestamps[i] for i in range(len(timestamps) - 1)]
+    return sum(1 for p in pauses if p > 0.5), sum(p for p in pauses if p > 0.5)
+
+
+def synthetic_clip(minutes, seed=0):
+    """Alternating voiced bursts (1-4 s) and silences (0.1-1.5 s); returns samples and true pauses >= 0.5 s."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    chunks, true_pauses, position = [], [], 0
+    while position < total:
+        burst = int(rng.uniform(1.0, 4.0) * SAMPLE_RATE)
+        t = np.arange(burst) / SAMPLE_RATE
+        voiced = 0.3 * np.sin(2 * np.pi * rng.uniform(100, 250) * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+        gap = rng.uniform(0.1, 1.5)
+        silence = rng.normal(0, 1e-4, int(gap * SAMPLE_RATE))
+        chunks += [voiced, silence]
+        position += burst + len(silence)
+        if gap >= 0.5 and position < total:
+            true_pauses.append(gap)
+    samples = np.concatenate(chunks)[:total].astype(np.float32)
+    return samples, true_pauses
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main():
+    print(f"{'clip':>6} {'method':>7} {'time (s)':>9} {'peak MiB':>9} {'pauses':>7} {'true':>5} {'hesitation (s)':>15} {'true':>7}")
+    for minutes in (1, 5, 10):
+        samples, true_pauses = synthetic_clip(minutes)
+        (legacy_count, legacy_hes), legacy_time, legacy_mem = measure(legacy_pauses, samples, SAMPLE_RATE)
+        stats, vad_time, vad_mem = measure(detect_pauses, samples, SAMPLE_RATE)
+        truth = (len(true_pauses), sum(true_pauses))
+        print(f"{minutes:>4}m {'legacy':>8} {legacy_time:>9.3f} {legacy_mem:>9.1f} {legacy_count:>7} {truth[0]:>5} {legacy_hes:>15.1f} {truth[1]:>7.1f}")
+        print(f"{minutes:>4}m {'vad':>8} {vad_time:>9.3f} {vad_mem:>9.1f} {stats['pause_count']:>7} {truth[0]:>5} "
+              f"{stats['hesitation_duration_seconds']:>15.1f} {truth[1]:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
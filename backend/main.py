@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import auth,interview , feedback
-from app.routes import audio
+from app.routes import audio, metrics
+from app.indexes import AUDIT_QUERY_PLANS_ON_STARTUP, CREATE_INDEXES_ON_STARTUP, audit_query_plans, ensure_indexes
+from app.services.model_registry import warm_up_from_env
+from app.utils.upload_spool import sweep_spool
 app = FastAPI(title="NextGen Interview Coach API", version="1.0")
 
 # Enable CORS for frontend requests
@@ -18,6 +21,36 @@ app.include_router(auth.router)
 app.include_router(interview.router, prefix="/interview")
 app.include_router(audio.router, prefix="/audio")
 app.include_router(feedback.router, prefix="/feedback")
+app.include_router(metrics.router, prefix="/metrics")
+
+@app.on_event("startup")
+def warm_up_models():
+    """Loads the models listed in WARMUP_MODELS up front; everything else loads on first use."""
+    warm_up_from_env()
+
+@app.on_event("startup")
+def create_indexes():
+    """
+    Creates any missing MongoDB indexes (see app/indexes.py; existing ones are left as they are),
+    then logs any hot query whose plan scans a whole collection.
+    """
+    if CREATE_INDEXES_ON_STARTUP:
+        try:
+            ensure_indexes()
+        except Exception as e:
+            print(f"Skipping index creation: {e}")
+    if AUDIT_QUERY_PLANS_ON_STARTUP:
+        try:
+            audit_query_plans()
+        except Exception as e:
+            print(f"Skipping query plan audit: {e}")
+
+@app.on_event("startup")
+def clean_upload_spool():
+    """Removes audio uploads left in the spool by a previous crash."""
+    removed = sweep_spool()
+    if removed:
+        print(f"Removed {removed} stale upload(s) from the spool")
 
 @app.get("/")
 def root():
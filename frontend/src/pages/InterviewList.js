@@ -17,6 +17,9 @@ const InterviewList = () => {
   const audioRef = useRef();
   const navigate = useNavigate();
   const [lockedQuestions, setLockedQuestions] = useState({});
+  // Status URLs of the feedback jobs queued by analyze-feedback (it answers 202 before analysing)
+  const feedbackJobs = useRef([]);
+  const [finishing, setFinishing] = useState(false);
   
 
   useEffect(() => {
@@ -40,6 +43,7 @@ const InterviewList = () => {
           new Array(fetchedQuestions.length).fill().map(() => ({
             typed: "",
             transcribed: "",
+            words: [],
             audioBlob: null,
             duration: 0,
           }))
@@ -120,6 +124,7 @@ const InterviewList = () => {
     updateAnswer("typed", "");
     updateAnswer("transcribed", "");
     updateAnswer("audioBlob", null);
+    updateAnswer("words", []);
   };
 
   const processAudio = async (blob) => {
@@ -134,6 +139,7 @@ const InterviewList = () => {
 
       const transcript = response.data.transcribed_text || "";
       updateAnswer("transcribed", transcript);
+      updateAnswer("words", response.data.words || []);
 
       const current = answers[currentQuestion];
       if (!current.typed.trim()) {
@@ -159,7 +165,7 @@ const InterviewList = () => {
     });
   };
   const submitSingleAnswer = async (index) => {
-    const { typed, transcribed, audioBlob,duration } = answers[index];
+    const { typed, transcribed, words, audioBlob,duration } = answers[index];
     const finalAnswer = typed.trim() || transcribed.trim();
     
     // Get the current user (this assumes getCurrentUser is working properly)
@@ -187,6 +193,10 @@ const InterviewList = () => {
   if (transcribed && transcribed.trim() !== "") {
     formData.append("transcription_text", transcribed);
   }
+  // Word timestamps from the local transcriber let the backend reuse them for speech rate
+  if (words && words.length > 0) {
+    formData.append("word_timestamps", JSON.stringify(words));
+  }
 
 
     console.log("Submitting single answer with following data:");
@@ -206,7 +216,10 @@ const InterviewList = () => {
       
     });
     
-    console.log(`Answer for question ${index + 1} saved.`, response.data);
+    console.log(`Answer for question ${index + 1} queued for feedback.`, response.data);
+    if (response.data.status_url) {
+      feedbackJobs.current.push(`http://127.0.0.1:8000${response.data.status_url}`);
+    }
   } catch (err) {
     console.error(`Failed to save answer for question ${index + 1}:`, err);
     alert(`Failed to save answer for question ${index + 1}`);
@@ -236,11 +249,34 @@ const handleNextQuestion = async () => {
   };
   
   
+  // Resolves once the job has saved its feedback (or failed, or is no longer known), at most after ~3 minutes
+  const waitForFeedbackJob = async (statusUrl) => {
+    for (let attempt = 0; attempt < 180; attempt++) {
+      try {
+        const res = await axios.get(statusUrl);
+        if (res.data.status === "completed" || res.data.status === "failed") {
+          return;
+        }
+      } catch (err) {
+        console.error("Failed to check feedback job:", err);
+        return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+    }
+  };
+
   const handleSubmit = async () => {
+    setFinishing(true);
     if (!lockedQuestions[currentQuestion]) {
-    await submitSingleAnswer(currentQuestion);
-  }
-  navigate("/feedback");
+      await submitSingleAnswer(currentQuestion);
+      setLockedQuestions((prev) => ({
+        ...prev,
+        [currentQuestion]: true,
+      }));
+    }
+    // Feedback is written by background jobs; wait for them so the feedback page shows every answer
+    await Promise.all(feedbackJobs.current.map(waitForFeedbackJob));
+    navigate("/feedback");
   };
 
   const formatQuestion = (q) => q.replace(/\*\*/g, "").replace(/^Q\d+:\s*/, "").trim();
@@ -365,13 +401,13 @@ const handleNextQuestion = async () => {
           ) : (
             <button
               onClick={handleSubmit}
-              disabled={!currentAnswered}
+              disabled={!currentAnswered || finishing}
 
               className={`px-6 py-2 rounded-lg font-semibold text-white transition ${
-                currentAnswered ? "bg-green-600 hover:bg-green-700" : "bg-gray-400 cursor-not-allowed"
+                currentAnswered && !finishing ? "bg-green-600 hover:bg-green-700" : "bg-gray-400 cursor-not-allowed"
               }`}
             >
-              ✅ Submit
+              {finishing ? "⏳ Analyzing answers..." : "✅ Submit"}
             </button>
           )}
         </div>